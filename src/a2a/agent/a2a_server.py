@@ -4,20 +4,90 @@ Acts as a wrapper for the FastAPI application and handles A2A Protocol
 """
 
 import os
+import time
 import logging
 from typing import Dict, Any, Optional
 from datetime import datetime
+from types import MappingProxyType
 from starlette.applications import Starlette
 from starlette.routing import Route
-from starlette.responses import JSONResponse
+from starlette.responses import JSONResponse, Response
 import httpx
+import orjson
 
 from .executor import get_agent_executor
+from .http_client import set_shared_http_client
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Path the A2A app is mounted under; the agent card advertises endpoints below it
+A2A_MOUNT_PATH = "/a2a"
+
+
+# Agent card capabilities are static, so build them once as read-only mappings
+_CAPABILITIES = (
+    MappingProxyType({
+        "name": "product_information",
+        "description": "Retrieve detailed information about specific products",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "message": {
+                    "type": "string",
+                    "description": "User message asking about product information"
+                }
+            },
+            "required": ["message"]
+        }
+    }),
+    MappingProxyType({
+        "name": "product_recommendations", 
+        "description": "Provide product recommendations based on customer needs and budget",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "message": {
+                    "type": "string",
+                    "description": "User message describing their needs"
+                }
+            },
+            "required": ["message"]
+        }
+    }),
+    MappingProxyType({
+        "name": "enhance_descriptions",
+        "description": "Create enhanced, marketing-friendly product descriptions",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "message": {
+                    "type": "string",
+                    "description": "Request to enhance product description"
+                }
+            },
+            "required": ["message"]
+        }
+    }),
+)
+
+
+_timestamp_cache = [0, ""]
+
+
+def _iso_now_cached() -> str:
+    """Current UTC time in ISO format, re-formatted at most once per second"""
+    now = int(time.time())
+    if now != _timestamp_cache[0]:
+        _timestamp_cache[:] = [now, datetime.utcfromtimestamp(now).isoformat()]
+    return _timestamp_cache[1]
+
+
+class ORJSONResponse(JSONResponse):
+    """JSONResponse that renders with orjson straight to bytes"""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NAIVE_UTC)
+
 
 class A2AServer:
     """
@@ -30,17 +100,32 @@ class A2AServer:
         self.httpx_client = httpx_client
         self.host = host
         self.port = port
+        
+        base_url = f"http://{self.host}:{self.port}{A2A_MOUNT_PATH}"
+        self._endpoints = {
+            "execute": f"{base_url}/execute",
+            "submit": f"{base_url}/submit",
+            "cancel": f"{base_url}/cancel/{{execution_id}}",
+            "status": f"{base_url}/status/{{execution_id}}",
+            "agent_card": f"{base_url}/agent-card"
+        }
+        set_shared_http_client(httpx_client)
         self.agent_executor = get_agent_executor()
         self._app = None
         
         # Initialize the Starlette app
         self._initialize_app()
+
+        # The agent card is static, so build and serialize it once
+        self._agent_card = self._get_agent_card()
+        self._agent_card_bytes = orjson.dumps(self._agent_card, default=dict)
     
     def _initialize_app(self):
         """Initialize the Starlette application with A2A routes"""
         routes = [
             Route("/agent-card", self._get_agent_card_endpoint, methods=["GET"]),
             Route("/execute", self._execute_endpoint, methods=["POST"]),
+            Route("/submit", self._submit_endpoint, methods=["POST"]),
             Route("/cancel/{execution_id}", self._cancel_endpoint, methods=["POST"]),
             Route("/status/{execution_id}", self._status_endpoint, methods=["GET"]),
             Route("/executions", self._list_executions_endpoint, methods=["GET"]),
@@ -65,56 +150,8 @@ class A2AServer:
             "name": "Zava Product Manager",
             "description": "A specialized agent for managing Zava product information, recommendations, and enhanced descriptions using Semantic Kernel",
             "version": "1.0.0",
-            "capabilities": [
-                {
-                    "name": "product_information",
-                    "description": "Retrieve detailed information about specific products",
-                    "input_schema": {
-                        "type": "object",
-                        "properties": {
-                            "message": {
-                                "type": "string",
-                                "description": "User message asking about product information"
-                            }
-                        },
-                        "required": ["message"]
-                    }
-                },
-                {
-                    "name": "product_recommendations", 
-                    "description": "Provide product recommendations based on customer needs and budget",
-                    "input_schema": {
-                        "type": "object",
-                        "properties": {
-                            "message": {
-                                "type": "string",
-                                "description": "User message describing their needs"
-                            }
-                        },
-                        "required": ["message"]
-                    }
-                },
-                {
-                    "name": "enhance_descriptions",
-                    "description": "Create enhanced, marketing-friendly product descriptions",
-                    "input_schema": {
-                        "type": "object",
-                        "properties": {
-                            "message": {
-                                "type": "string",
-                                "description": "Request to enhance product description"
-                            }
-                        },
-                        "required": ["message"]
-                    }
-                }
-            ],
-            "endpoints": {
-                "execute": f"http://{self.host}:{self.port}/a2a/execute",
-                "cancel": f"http://{self.host}:{self.port}/a2a/cancel/{{execution_id}}",
-                "status": f"http://{self.host}:{self.port}/a2a/status/{{execution_id}}",
-                "agent_card": f"http://{self.host}:{self.port}/a2a/agent-card"
-            },
+            "capabilities": _CAPABILITIES,
+            "endpoints": self._endpoints,
             "protocols": ["A2A-v1.0"],
             "supported_message_types": ["text"],
             "created_at": datetime.utcnow().isoformat(),
@@ -127,11 +164,10 @@ class A2AServer:
     async def _get_agent_card_endpoint(self, request):
         """Agent card endpoint"""
         try:
-            agent_card = self._get_agent_card()
-            return JSONResponse(agent_card)
+            return Response(self._agent_card_bytes, media_type="application/json")
         except Exception as e:
-            logger.error(f"Error getting agent card: {e}")
-            return JSONResponse(
+            logger.error("Error getting agent card: %s", e)
+            return ORJSONResponse(
                 {"error": "Failed to retrieve agent card"},
                 status_code=500
             )
@@ -139,11 +175,17 @@ class A2AServer:
     async def _execute_endpoint(self, request):
         """Execute agent request endpoint"""
         try:
-            body = await request.json()
+            try:
+                body = orjson.loads(await request.body())
+            except orjson.JSONDecodeError:
+                return ORJSONResponse(
+                    {"error": "Request body must be valid JSON"},
+                    status_code=400
+                )
             
             # Validate required fields
             if "message" not in body:
-                return JSONResponse(
+                return ORJSONResponse(
                     {"error": "Message is required"},
                     status_code=400
                 )
@@ -151,15 +193,45 @@ class A2AServer:
             # Execute the request
             result = await self.agent_executor.execute(body)
             
-            return JSONResponse(result)
+            return ORJSONResponse(result)
             
         except Exception as e:
-            logger.error(f"Error executing request: {e}")
-            return JSONResponse(
+            logger.error("Error executing request: %s", e)
+            return ORJSONResponse(
                 {"error": f"Execution failed: {str(e)}"},
                 status_code=500
             )
     
+    async def _submit_endpoint(self, request):
+        """Submit agent request for background execution endpoint"""
+        try:
+            try:
+                body = orjson.loads(await request.body())
+            except orjson.JSONDecodeError:
+                return ORJSONResponse(
+                    {"error": "Request body must be valid JSON"},
+                    status_code=400
+                )
+            
+            # Validate required fields
+            if "message" not in body:
+                return ORJSONResponse(
+                    {"error": "Message is required"},
+                    status_code=400
+                )
+            
+            # Schedule the request and return immediately
+            execution_id = self.agent_executor.submit(body)
+            
+            return ORJSONResponse({"execution_id": execution_id}, status_code=202)
+            
+        except Exception as e:
+            logger.error("Error submitting request: %s", e)
+            return ORJSONResponse(
+                {"error": f"Submission failed: {str(e)}"},
+                status_code=500
+            )
+    
     async def _cancel_endpoint(self, request):
         """Cancel execution endpoint"""
         try:
@@ -167,11 +239,11 @@ class A2AServer:
             result = await self.agent_executor.cancel(execution_id)
             
             status_code = 200 if result.get("status") != "error" else 400
-            return JSONResponse(result, status_code=status_code)
+            return ORJSONResponse(result, status_code=status_code)
             
         except Exception as e:
-            logger.error(f"Error cancelling execution: {e}")
-            return JSONResponse(
+            logger.error("Error cancelling execution: %s", e)
+            return ORJSONResponse(
                 {"error": f"Cancel failed: {str(e)}"},
                 status_code=500
             )
@@ -183,11 +255,11 @@ class A2AServer:
             result = self.agent_executor.get_execution_status(execution_id)
             
             status_code = 200 if result.get("status") != "error" else 404
-            return JSONResponse(result, status_code=status_code)
+            return ORJSONResponse(result, status_code=status_code)
             
         except Exception as e:
-            logger.error(f"Error getting execution status: {e}")
-            return JSONResponse(
+            logger.error("Error getting execution status: %s", e)
+            return ORJSONResponse(
                 {"error": f"Status retrieval failed: {str(e)}"},
                 status_code=500
             )
@@ -196,20 +268,56 @@ class A2AServer:
         """List all executions endpoint"""
         try:
             result = self.agent_executor.list_executions()
-            return JSONResponse({"executions": result})
+            return ORJSONResponse({"executions": result})
             
         except Exception as e:
-            logger.error(f"Error listing executions: {e}")
-            return JSONResponse(
+            logger.error("Error listing executions: %s", e)
+            return ORJSONResponse(
                 {"error": f"Listing executions failed: {str(e)}"},
                 status_code=500
             )
     
     async def _health_endpoint(self, request):
         """Health check endpoint"""
-        return JSONResponse({
+        return ORJSONResponse({
             "status": "healthy",
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": _iso_now_cached(),
             "agent_id": "zava-product-manager",
             "version": "1.0.0"
-        })
\ No newline at end of file
+        })
+
+
+if __name__ == "__main__":
+    import uvicorn
+    from contextlib import asynccontextmanager
+    from starlette.routing import Mount
+
+    # Run the A2A server standalone on uvloop + httptools with access logging off
+    from .http_client import create_http_client
+
+    http_client = create_http_client()
+    server = A2AServer(
+        http_client,
+        host=os.getenv("HOST", "0.0.0.0"),
+        port=int(os.getenv("PORT", 8001))
+    )
+
+    @asynccontextmanager
+    async def lifespan(app):
+        yield
+        await http_client.aclose()
+
+    # Mount at the same path as the full app, so the agent card's endpoints resolve
+    standalone_app = Starlette(
+        routes=[Mount(A2A_MOUNT_PATH, app=server.get_starlette_app())],
+        lifespan=lifespan
+    )
+    uvicorn.run(
+        standalone_app,
+        host=server.host,
+        port=server.port,
+        loop="uvloop",
+        http="httptools",
+        access_log=False,
+        log_level="warning"
+    )
@@ -0,0 +1,45 @@
+"""
+Azure OpenAI settings for the A2A agents
+Environment variables are resolved once per process and shared
+"""
+
+import functools
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+# Base endpoint for GPT-4.1 (without the deployment path)
+GPT_ENDPOINT = "https://admin-mh2k31bc-eastus2.cognitiveservices.azure.com"
+
+
+@dataclass(frozen=True, slots=True)
+class AzureConfig:
+    """Connection settings for an Azure OpenAI deployment"""
+    endpoint: Optional[str]
+    api_key: Optional[str]
+    deployment: str
+    api_version: str
+
+
+# Resolved on first use rather than at import, so values loaded by
+# load_dotenv() in main.py are picked up
+@functools.cache
+def get_azure_openai_config() -> AzureConfig:
+    """Get the settings from the AZURE_OPENAI_* environment variables"""
+    return AzureConfig(
+        endpoint=os.getenv("AZURE_OPENAI_ENDPOINT"),
+        api_key=os.getenv("AZURE_OPENAI_KEY"),
+        deployment=os.getenv("gpt_deployment", "gpt-4.1"),
+        api_version=os.getenv("AZURE_OPENAI_API_VERSION", "2024-12-01-preview")
+    )
+
+
+@functools.cache
+def get_gpt_config() -> AzureConfig:
+    """Get the settings for the GPT-4.1 endpoint from the gpt_* environment variables"""
+    return AzureConfig(
+        endpoint=GPT_ENDPOINT,
+        api_key=os.getenv("gpt_api_key"),
+        deployment=os.getenv("gpt_deployment", "gpt-4.1"),
+        api_version=os.getenv("gpt_api_version", "2024-12-01-preview")
+    )
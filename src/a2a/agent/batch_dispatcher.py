@@ -0,0 +1,188 @@
+"""
+Batch dispatcher for non-interactive chat requests
+Buffers requests briefly and submits them together through the Azure OpenAI Batch API
+"""
+
+import asyncio
+import functools
+import logging
+import os
+from typing import List, Optional, Tuple
+
+import orjson
+
+from .azure_config import get_gpt_config
+from .http_client import LLM_TIMEOUT, get_shared_http_client
+from .prompts import PRODUCT_ASSISTANT_PROMPT
+
+logger = logging.getLogger(__name__)
+
+# Batch jobs that have reached one of these states will not progress further
+_TERMINAL_BATCH_STATUSES = frozenset({"completed", "failed", "expired", "cancelled"})
+
+
+class BatchDispatcher:
+    """
+    Collects chat requests into Azure OpenAI Batch API jobs
+    
+    Requests are buffered for a short window (or until the batch is full),
+    written as one JSONL input file and submitted as a single batch job. Each
+    caller awaits a future that is resolved when the job's output is ready.
+    Batch jobs trade latency for throughput, so this is only for callers that
+    explicitly opt in.
+    """
+    
+    def __init__(
+        self,
+        deployment: str,
+        max_batch_size: int = 100,
+        flush_interval: float = 0.05,
+        poll_interval: float = 30.0
+    ):
+        self.deployment = deployment
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval
+        self.poll_interval = poll_interval
+        self._queue: "asyncio.Queue[Tuple[str, str, asyncio.Future]]" = asyncio.Queue()
+        self._worker: Optional[asyncio.Task] = None
+        self._batch_tasks: set = set()
+        self._next_id = 0
+        self._client = None
+    
+    def _get_client(self):
+        """Create the Azure OpenAI client on first use, on the shared HTTP pool"""
+        if self._client is None:
+            from openai import AsyncAzureOpenAI
+            cfg = get_gpt_config()
+            self._client = AsyncAzureOpenAI(
+                azure_endpoint=cfg.endpoint,
+                api_key=cfg.api_key,
+                api_version=cfg.api_version,
+                http_client=get_shared_http_client(),
+                timeout=LLM_TIMEOUT
+            )
+        return self._client
+    
+    async def submit(self, message: str) -> str:
+        """
+        Queue a message for the next batch and wait for its completion
+        
+        Batch jobs can take hours, so callers should run this in the background
+        (e.g. via AgentExecutor.submit) rather than await it in a request handler.
+        
+        Args:
+            message: The user message
+            
+        Returns:
+            The response text
+        """
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._collect())
+        
+        self._next_id += 1
+        custom_id = f"request-{self._next_id}"
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((custom_id, message, future))
+        
+        return await future
+    
+    async def _collect(self):
+        """Group queued requests into batches and hand each one off for submission"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.flush_interval
+            
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            
+            task = asyncio.create_task(self._process_batch(batch))
+            self._batch_tasks.add(task)
+            task.add_done_callback(self._batch_tasks.discard)
+    
+    async def _process_batch(self, batch: List[Tuple[str, str, asyncio.Future]]):
+        """Submit one batch job and resolve its callers' futures from the output"""
+        futures = {custom_id: future for custom_id, _, future in batch}
+        try:
+            client = self._get_client()
+            
+            input_lines = b"\n".join(
+                orjson.dumps({
+                    "custom_id": custom_id,
+                    "method": "POST",
+                    "url": "/chat/completions",
+                    "body": {
+                        "model": self.deployment,
+                        "messages": [
+                            {"role": "system", "content": PRODUCT_ASSISTANT_PROMPT},
+                            {"role": "user", "content": message}
+                        ]
+                    }
+                })
+                for custom_id, message, _ in batch
+            )
+            input_file = await client.files.create(
+                file=("batch_input.jsonl", input_lines),
+                purpose="batch"
+            )
+            job = await client.batches.create(
+                input_file_id=input_file.id,
+                endpoint="/chat/completions",
+                completion_window="24h"
+            )
+            logger.info("Submitted batch %s with %s requests", job.id, len(batch))
+            
+            while job.status not in _TERMINAL_BATCH_STATUSES:
+                await asyncio.sleep(self.poll_interval)
+                job = await client.batches.retrieve(job.id)
+            
+            if job.status != "completed" or not job.output_file_id:
+                raise RuntimeError(f"Batch {job.id} ended with status {job.status}")
+            
+            output = await client.files.content(job.output_file_id)
+            for line in output.content.splitlines():
+                if not line.strip():
+                    continue
+                record = orjson.loads(line)
+                future = futures.pop(record.get("custom_id"), None)
+                if future is None or future.done():
+                    continue
+                
+                body = (record.get("response") or {}).get("body") or {}
+                choices = body.get("choices") or []
+                if choices:
+                    future.set_result(choices[0]["message"].get("content") or "No response generated")
+                else:
+                    future.set_exception(RuntimeError(f"Batch request failed: {record.get('error')}"))
+            
+            # Anything not present in the output did not complete
+            for future in futures.values():
+                if not future.done():
+                    future.set_exception(RuntimeError("Batch request produced no output"))
+                    
+        except Exception as e:
+            logger.error("Batch processing failed: %s", e)
+            for future in futures.values():
+                if not future.done():
+                    future.set_exception(e)
+
+
+@functools.lru_cache(maxsize=None)
+def get_batch_dispatcher() -> BatchDispatcher:
+    """
+    Get or create the global BatchDispatcher instance
+    
+    Raises:
+        RuntimeError: If no batch deployment is configured. The Batch API only
+            accepts Global-Batch deployments, so the real-time one is no fallback.
+    """
+    deployment = os.getenv("gpt_batch_deployment")
+    if not deployment:
+        raise RuntimeError("gpt_batch_deployment must name a Global-Batch deployment to use batch processing")
+    return BatchDispatcher(deployment=deployment)
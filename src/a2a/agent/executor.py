@@ -4,26 +4,56 @@ Handles the execution lifecycle of agent requests
 """
 
 import asyncio
+import functools
 import logging
-import uuid
-from typing import Dict, Any, Optional, List
+import os
+import time
+from collections import OrderedDict
+from typing import AsyncIterator, Awaitable, Callable, Dict, Any, Final, Optional, List, Tuple
 from datetime import datetime
-from enum import Enum
 
 from .product_management_agent import get_enhanced_product_manager
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-class ExecutionStatus(Enum):
-    """Execution status enumeration"""
-    PENDING = "pending"
-    RUNNING = "running"
-    COMPLETED = "completed"
-    CANCELLED = "cancelled" 
-    FAILED = "failed"
+def _format_timestamp(timestamp: Optional[float]) -> Optional[str]:
+    """Format a stored epoch timestamp as an ISO string"""
+    return datetime.utcfromtimestamp(timestamp).isoformat() if timestamp else None
+
+
+class ExecutionStatus:
+    """Execution status values, stored and serialized as plain strings"""
+    PENDING: Final = "pending"
+    RUNNING: Final = "running"
+    COMPLETED: Final = "completed"
+    CANCELLED: Final = "cancelled"
+    FAILED: Final = "failed"
+    TERMINAL: Final = frozenset({COMPLETED, FAILED, CANCELLED})
+
+
+class ExecutionStore(OrderedDict):
+    """
+    Bounded FIFO of execution records, keyed by execution ID
+    
+    Beyond max_size the oldest finished entry is evicted, so pending and
+    running executions stay visible to status polling. Only if every entry
+    is still active is the oldest one dropped regardless.
+    """
+    
+    def __init__(self, max_size: int = 10_000):
+        super().__init__()
+        self.max_size = max_size
+    
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        if len(self) > self.max_size:
+            for old_key, record in self.items():
+                if record.get("status") in ExecutionStatus.TERMINAL:
+                    del self[old_key]
+                    break
+            else:
+                self.popitem(last=False)
 
 
 class AgentExecutor:
@@ -33,8 +63,47 @@ class AgentExecutor:
     """
     
     def __init__(self):
-        self.executions: Dict[str, Dict[str, Any]] = {}
+        self.executions: Dict[str, Dict[str, Any]] = ExecutionStore()
+        # Summaries are kept up to date on status transitions so listing is cheap
+        self._summaries: Dict[str, Dict[str, Any]] = ExecutionStore()
         self.product_manager = get_enhanced_product_manager()
+        # Tasks of submitted executions, kept so they can be cancelled
+        self._tasks: Dict[str, asyncio.Task] = {}
+    
+    def _create_execution(self, request: Dict[str, Any]) -> str:
+        """Register a new pending execution and return its ID"""
+        # Opaque 128-bit random ID; only ever used as a lookup key
+        execution_id = os.urandom(16).hex()
+        start_time = time.time()
+        
+        # Initialize execution tracking
+        self.executions[execution_id] = {
+            "id": execution_id,
+            "status": ExecutionStatus.PENDING,
+            "request": request,
+            "result": None,
+            "error": None,
+            "start_time": start_time,
+            "end_time": None
+        }
+        self._summaries[execution_id] = {
+            "execution_id": execution_id,
+            "status": ExecutionStatus.PENDING,
+            "start_time": _format_timestamp(start_time),
+            "end_time": None
+        }
+        
+        return execution_id
+    
+    def _update_summary(self, execution_id: str, status: str, end_time: Optional[float] = None):
+        """Record a status transition in the precomputed execution summary"""
+        summary = self._summaries.get(execution_id)
+        if summary is None:
+            return
+        
+        summary["status"] = status
+        if end_time is not None:
+            summary["end_time"] = _format_timestamp(end_time)
         
     async def execute(self, request: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -46,72 +115,191 @@ class AgentExecutor:
         Returns:
             Dict containing execution result
         """
-        execution_id = str(uuid.uuid4())
+        execution_id = self._create_execution(request)
+        return await self._run(execution_id, request)
+    
+    def submit(
+        self,
+        request: Dict[str, Any],
+        process: Optional[Callable[[str], Awaitable[str]]] = None
+    ) -> str:
+        """
+        Schedule an agent request in the background
         
-        # Initialize execution tracking
-        self.executions[execution_id] = {
-            "id": execution_id,
-            "status": ExecutionStatus.PENDING,
-            "request": request,
-            "result": None,
-            "error": None,
-            "start_time": datetime.utcnow(),
-            "end_time": None
-        }
+        Args:
+            request: The agent request containing message and context
+            process: Coroutine function producing the response for the message;
+                defaults to the Enhanced Product Manager
+            
+        Returns:
+            The execution ID, which can be polled via get_execution_status
+        """
+        execution_id = self._create_execution(request)
+        
+        task = asyncio.create_task(self._run(execution_id, request, process))
+        self._tasks[execution_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(execution_id, None))
+        
+        return execution_id
+    
+    async def _run(
+        self,
+        execution_id: str,
+        request: Dict[str, Any],
+        process: Optional[Callable[[str], Awaitable[str]]] = None
+    ) -> Dict[str, Any]:
+        """Process a tracked execution and record its outcome"""
+        # Hold a direct reference so the record can still be updated if it is evicted mid-run
+        execution = self.executions[execution_id]
         
         try:
-            logger.info(f"Starting execution {execution_id}")
+            message = self._start(execution_id, execution, request)
             
-            # Update status to running
-            self.executions[execution_id]["status"] = ExecutionStatus.RUNNING
+            # Process the message using the Enhanced Product Manager unless told otherwise
+            response = await (process or self.product_manager.process_message)(message)
             
-            # Extract message from request
-            message = request.get("message", "")
+            # A cancel that arrived while the request was in flight wins
+            if execution["status"] in ExecutionStatus.TERMINAL:
+                return self._cancelled_result(execution_id)
             
-            if not message:
-                raise ValueError("Message is required")
+            return self._complete(execution_id, execution, response)
             
-            # Process the message using the Enhanced Product Manager
-            response = await self.product_manager.process_message(message)
+        except asyncio.CancelledError:
+            if execution["status"] not in ExecutionStatus.TERMINAL:
+                self._mark_cancelled(execution_id, execution)
+            raise
             
-            # Prepare the result
-            result = {
-                "execution_id": execution_id,
-                "response": response,
-                "status": "success",
-                "timestamp": datetime.utcnow().isoformat(),
-                "agent_type": "product_manager"
-            }
+        except Exception as e:
+            if execution["status"] in ExecutionStatus.TERMINAL:
+                return self._cancelled_result(execution_id)
+            return self._fail(execution_id, execution, e)
+    
+    def stream(self, request: Dict[str, Any]) -> Tuple[str, AsyncIterator[str]]:
+        """
+        Execute an agent request, streaming the response as it is generated
+        
+        Args:
+            request: The agent request containing message and context
+            
+        Returns:
+            Tuple of (execution ID, async iterator of response text chunks).
+            The execution is tracked like any other and completes when the
+            iterator is exhausted.
+        """
+        execution_id = self._create_execution(request)
+        return execution_id, self._run_stream(execution_id, request)
+    
+    async def _run_stream(self, execution_id: str, request: Dict[str, Any]) -> AsyncIterator[str]:
+        """Stream a tracked execution and record its outcome once the stream ends"""
+        execution = self.executions[execution_id]
+        # Cancelling the execution stops the task that is consuming the stream
+        self._tasks[execution_id] = asyncio.current_task()
+        
+        try:
+            message = self._start(execution_id, execution, request)
             
-            # Update execution status
-            self.executions[execution_id].update({
-                "status": ExecutionStatus.COMPLETED,
-                "result": result,
-                "end_time": datetime.utcnow()
-            })
+            chunks = []
+            async for chunk in self.product_manager.stream_message(message):
+                if execution["status"] in ExecutionStatus.TERMINAL:
+                    return
+                chunks.append(chunk)
+                yield chunk
             
-            logger.info(f"Execution {execution_id} completed successfully")
-            return result
+            self._complete(execution_id, execution, "".join(chunks))
             
-        except Exception as e:
-            error_msg = f"Execution failed: {str(e)}"
-            logger.error(f"Execution {execution_id} failed: {error_msg}")
+        except (asyncio.CancelledError, GeneratorExit):
+            # Cancelled, or the client went away mid-stream
+            if execution["status"] not in ExecutionStatus.TERMINAL:
+                self._mark_cancelled(execution_id, execution)
+            raise
             
-            # Update execution status with error
-            self.executions[execution_id].update({
-                "status": ExecutionStatus.FAILED,
-                "error": error_msg,
-                "end_time": datetime.utcnow()
-            })
+        except Exception as e:
+            if execution["status"] not in ExecutionStatus.TERMINAL:
+                yield self._fail(execution_id, execution, e)["response"]
             
-            return {
-                "execution_id": execution_id,
-                "response": f"I apologize, but I encountered an error processing your request: {error_msg}",
-                "status": "error",
-                "timestamp": datetime.utcnow().isoformat(),
-                "agent_type": "product_manager",
-                "error": error_msg
-            }
+        finally:
+            self._tasks.pop(execution_id, None)
+    
+    def _start(self, execution_id: str, execution: Dict[str, Any], request: Dict[str, Any]) -> str:
+        """Mark an execution as running and return its message"""
+        logger.info("Starting execution %s", execution_id)
+        
+        # Update status to running
+        execution["status"] = ExecutionStatus.RUNNING
+        self._update_summary(execution_id, ExecutionStatus.RUNNING)
+        
+        # Extract message from request
+        message = request.get("message", "")
+        
+        if not message:
+            raise ValueError("Message is required")
+        return message
+    
+    def _complete(self, execution_id: str, execution: Dict[str, Any], response: str) -> Dict[str, Any]:
+        """Record a successful execution and return its result"""
+        end_time = time.time()
+
+        # Prepare the result
+        result = {
+            "execution_id": execution_id,
+            "response": response,
+            "status": "success",
+            "timestamp": _format_timestamp(end_time),
+            "agent_type": "product_manager"
+        }
+        
+        # Update execution status
+        execution.update({
+            "status": ExecutionStatus.COMPLETED,
+            "result": result,
+            "end_time": end_time
+        })
+        self._update_summary(execution_id, ExecutionStatus.COMPLETED, end_time)
+        
+        logger.info("Execution %s completed successfully", execution_id)
+        return result
+    
+    def _fail(self, execution_id: str, execution: Dict[str, Any], e: Exception) -> Dict[str, Any]:
+        """Record a failed execution and return its error result"""
+        error_msg = f"Execution failed: {str(e)}"
+        logger.error("Execution %s failed: %s", execution_id, error_msg)
+        end_time = time.time()
+        
+        # Update execution status with error
+        execution.update({
+            "status": ExecutionStatus.FAILED,
+            "error": error_msg,
+            "end_time": end_time
+        })
+        self._update_summary(execution_id, ExecutionStatus.FAILED, end_time)
+        
+        return {
+            "execution_id": execution_id,
+            "response": f"I apologize, but I encountered an error processing your request: {error_msg}",
+            "status": "error",
+            "timestamp": _format_timestamp(end_time),
+            "agent_type": "product_manager",
+            "error": error_msg
+        }
+    
+    def _mark_cancelled(self, execution_id: str, execution: Dict[str, Any]):
+        """Record an execution as cancelled"""
+        end_time = time.time()
+        execution.update({
+            "status": ExecutionStatus.CANCELLED,
+            "end_time": end_time
+        })
+        self._update_summary(execution_id, ExecutionStatus.CANCELLED, end_time)
+    
+    def _cancelled_result(self, execution_id: str) -> Dict[str, Any]:
+        """Result returned by a run whose execution was cancelled"""
+        return {
+            "execution_id": execution_id,
+            "response": "Execution was cancelled",
+            "status": "cancelled",
+            "timestamp": _format_timestamp(time.time()),
+            "agent_type": "product_manager"
+        }
     
     async def cancel(self, execution_id: str) -> Dict[str, Any]:
         """
@@ -132,20 +320,21 @@ class AgentExecutor:
         
         execution = self.executions[execution_id]
         
-        if execution["status"] in [ExecutionStatus.COMPLETED, ExecutionStatus.FAILED, ExecutionStatus.CANCELLED]:
+        if execution["status"] in ExecutionStatus.TERMINAL:
             return {
                 "execution_id": execution_id,
                 "status": "error",
-                "message": f"Execution already {execution['status'].value}"
+                "message": f"Execution already {execution['status']}"
             }
         
-        # Update status to cancelled
-        execution.update({
-            "status": ExecutionStatus.CANCELLED,
-            "end_time": datetime.utcnow()
-        })
+        # Update status to cancelled, then stop the background task if there
+        # is one; a run awaited by a caller sees the status and drops its result
+        self._mark_cancelled(execution_id, execution)
+        task = self._tasks.pop(execution_id, None)
+        if task is not None:
+            task.cancel()
         
-        logger.info(f"Execution {execution_id} cancelled")
+        logger.info("Execution %s cancelled", execution_id)
         
         return {
             "execution_id": execution_id,
@@ -163,20 +352,18 @@ class AgentExecutor:
         Returns:
             Dict containing execution status
         """
-        if execution_id not in self.executions:
+        execution = self.executions.get(execution_id)
+        summary = self._summaries.get(execution_id)
+        if execution is None or summary is None:
             return {
                 "execution_id": execution_id,
                 "status": "error",
                 "message": "Execution not found"
             }
         
-        execution = self.executions[execution_id]
-        
+        # Reuse the precomputed summary so no timestamps are formatted per request
         return {
-            "execution_id": execution_id,
-            "status": execution["status"].value,
-            "start_time": execution["start_time"].isoformat() if execution["start_time"] else None,
-            "end_time": execution["end_time"].isoformat() if execution["end_time"] else None,
+            **summary,
             "result": execution.get("result"),
             "error": execution.get("error")
         }
@@ -186,25 +373,15 @@ class AgentExecutor:
         List all executions
         
         Returns:
-            List of execution summaries
+            List of execution summaries. The summary dicts are shared, not
+            copied, so callers should serialize them rather than mutate them.
+            This only copies references, so it is cheap enough to run on the
+            event loop; the execution store is capped, so it never grows unbounded.
         """
-        return [
-            {
-                "execution_id": execution_id,
-                "status": execution["status"].value,
-                "start_time": execution["start_time"].isoformat() if execution["start_time"] else None,
-                "end_time": execution["end_time"].isoformat() if execution["end_time"] else None
-            }
-            for execution_id, execution in self.executions.items()
-        ]
-
+        return list(self._summaries.values())
 
-# Global instance
-agent_executor = None
 
+@functools.lru_cache(maxsize=None)
 def get_agent_executor() -> AgentExecutor:
     """Get or create the global AgentExecutor instance"""
-    global agent_executor
-    if agent_executor is None:
-        agent_executor = AgentExecutor()
-    return agent_executor
\ No newline at end of file
+    return AgentExecutor()
\ No newline at end of file
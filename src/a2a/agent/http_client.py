@@ -0,0 +1,104 @@
+"""
+Shared HTTP client for the A2A application
+Provides a pooled httpx client whose responses decode JSON with orjson
+"""
+
+from typing import Optional
+
+import httpx
+import orjson
+
+# Pooled client shared by every Azure OpenAI caller in the process
+_shared_http_client: Optional[httpx.AsyncClient] = None
+
+# Timeout for Azure OpenAI calls made over the shared client. The pool's own
+# 30s timeout suits agent-to-agent calls, but long completions and tool-calling
+# turns need the SDK's 600s default, which passing http_client would replace.
+LLM_TIMEOUT = httpx.Timeout(600.0, connect=5.0)
+
+
+class ORJSONResponse(httpx.Response):
+    """httpx Response that parses JSON bodies with orjson"""
+    
+    def json(self, **kwargs):
+        if kwargs:
+            return super().json(**kwargs)
+        return orjson.loads(self.content)
+
+
+class ORJSONTransport(httpx.AsyncBaseTransport):
+    """Transport wrapper that returns ORJSONResponse objects"""
+    
+    def __init__(self, transport: httpx.AsyncBaseTransport):
+        self._transport = transport
+    
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        response = await self._transport.handle_async_request(request)
+        return ORJSONResponse(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=response.stream,
+            extensions=response.extensions,
+            request=request
+        )
+    
+    async def aclose(self):
+        await self._transport.aclose()
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """
+    Create the pooled HTTP/2 client shared by the A2A server and the agent
+    
+    The Azure OpenAI SDK parses completions via Response.json(), so routing
+    them through ORJSONTransport moves that decoding onto orjson.
+    """
+    transport = httpx.AsyncHTTPTransport(
+        http2=True,
+        limits=httpx.Limits(
+            max_connections=200,
+            max_keepalive_connections=50,
+            keepalive_expiry=30
+        )
+    )
+    return httpx.AsyncClient(
+        transport=ORJSONTransport(transport),
+        timeout=httpx.Timeout(30.0, connect=5.0)
+    )
+
+
+def set_shared_http_client(http_client: Optional[httpx.AsyncClient]):
+    """Register the pooled HTTP client used for Azure OpenAI calls"""
+    global _shared_http_client
+    _shared_http_client = http_client
+
+
+def get_shared_http_client() -> Optional[httpx.AsyncClient]:
+    """Get the registered pooled HTTP client, if any"""
+    return _shared_http_client
+
+
+def create_azure_openai_client(
+    endpoint: str,
+    api_key: Optional[str],
+    api_version: str,
+    http_client: Optional[httpx.AsyncClient] = None
+):
+    """
+    Create an AsyncAzureOpenAI client on the shared connection pool
+    
+    Returns None when no pooled client is available, in which case Semantic
+    Kernel falls back to building its own client.
+    """
+    http_client = http_client or _shared_http_client
+    if http_client is None:
+        return None
+    
+    from openai import AsyncAzureOpenAI
+    return AsyncAzureOpenAI(
+        azure_endpoint=endpoint,
+        api_key=api_key,
+        api_version=api_version,
+        http_client=http_client,
+        timeout=LLM_TIMEOUT
+    )
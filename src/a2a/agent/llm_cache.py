@@ -0,0 +1,69 @@
+"""
+LLM response cache for the Product Manager agents
+Avoids repeat Azure OpenAI round-trips for prompts that were already answered
+"""
+
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class LLMCache:
+    """
+    Bounded LRU cache of LLM completions with a time-to-live
+
+    Keys are hashed from the exact prompt text, so prompts that differ only in
+    case or spacing (SKUs, product names, code) never share an entry. Callers
+    include the deployment and generation settings in the key parts so a
+    configuration change can't serve answers produced under the old one.
+    Entries expire after ttl seconds, and clear() drops everything, e.g. when
+    the product catalog changes.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: float = 300.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        # key -> (expiry on the monotonic clock, completion)
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+
+    @staticmethod
+    def make_key(*parts: str) -> str:
+        """Build a cache key from the prompt parts (namespace, history, message)"""
+        return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def history_parts(conversation_history: Optional[Iterable[Dict]]) -> List[str]:
+        """Key parts for a conversation history, one per entry"""
+        return [
+            f"{entry.get('role')}:{entry.get('content', '')}"
+            for entry in conversation_history or ()
+        ]
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached completion for key, marking it as recently used"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, response = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return response
+
+    def put(self, key: str, response: str):
+        """Store a completion, evicting the least recently used entry when full"""
+        self._entries[key] = (time.monotonic() + self.ttl, response)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop every cached completion"""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
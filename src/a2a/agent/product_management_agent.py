@@ -4,27 +4,111 @@ This implementation follows the TechWorkshop requirements for multi-agent archit
 """
 
 import os
+import functools
 import logging
 import time
-from typing import Any, Annotated
-from semantic_kernel import Kernel
-from semantic_kernel.agents import ChatCompletionAgent
-from semantic_kernel.connectors.ai.open_ai import AzureChatCompletion
-from semantic_kernel.functions.kernel_function_decorator import kernel_function
-from semantic_kernel.contents.chat_history import ChatHistory
-from semantic_kernel.contents.chat_message_content import ChatMessageContent, AuthorRole
-from opentelemetry import trace
+from contextlib import contextmanager
+from typing import Annotated, AsyncIterator, Optional
+import httpx
+import orjson
+
+from .http_client import create_azure_openai_client
+from .llm_cache import LLMCache
+
+# Semantic Kernel, OpenAI and OpenTelemetry are imported where they are used
+# to keep module import (and process cold start) light
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Initialize OpenTelemetry tracer for agent monitoring
-tracer = trace.get_tracer(__name__)
+
+@functools.cache
+def _tracer():
+    """OpenTelemetry tracer for agent monitoring, created on first use"""
+    from opentelemetry import trace
+    return trace.get_tracer(__name__)
+
+
+@functools.cache
+def _otel_enabled() -> bool:
+    """Whether a trace exporter is configured; checked once on first use"""
+    return bool(
+        os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT")
+        or os.getenv("OTEL_ENABLED")
+        or os.getenv("APPLICATIONINSIGHTS_CONNECTION_STRING")
+    )
+
+
+class _NullSpan:
+    """No-op span used when tracing is disabled"""
+    
+    def set_attribute(self, key, value):
+        pass
+    
+    def record_exception(self, exception):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+@contextmanager
+def _span(name: str):
+    """Start a tracing span, or yield a no-op span when no exporter is configured"""
+    if _otel_enabled():
+        with _tracer().start_as_current_span(name) as span:
+            yield span
+    else:
+        yield _NULL_SPAN
 
 # Constants for span attributes
 PROCESSING_STATUS_ATTR = "processing.status"
 
+# Simulated product catalog used by the ProductPlugin
+# In a real implementation, this would query a database or external service
+_PRODUCT_CATALOG = (
+    {
+        "id": "1",
+        "name": "Eco-Friendly Paint Roller",
+        "type": "Paint Roller",
+        "description": "A high-quality, eco-friendly paint roller for smooth finishes.",
+        "punchLine": "Roll with the best, paint with the rest!",
+        "price": 15.99
+    },
+    {
+        "id": "2",
+        "name": "Premium Paint Brush Set",
+        "type": "Paint Brush",
+        "description": "A set of premium paint brushes for detailed work and fine finishes.",
+        "punchLine": "Brush up your skills with our premium set!",
+        "price": 25.49
+    },
+    {
+        "id": "3",
+        "name": "All-Purpose Paint Tray",
+        "type": "Paint Tray",
+        "description": "A durable paint tray suitable for all types of rollers and brushes.",
+        "punchLine": "Tray it, paint it, love it!",
+        "price": 9.99
+    },
+    {
+        "id": "4",
+        "name": "Standard Paint Roller",
+        "type": "Paint Roller",
+        "description": "A reliable paint roller for smooth and even paint application.",
+        "punchLine": "Standard quality, extraordinary results!",
+        "price": 12.99
+    },
+    {
+        "id": "5",
+        "name": "Professional Paint Sprayer",
+        "type": "Paint Sprayer",
+        "description": "Professional-grade paint sprayer for large projects and smooth finishes.",
+        "punchLine": "Spray your way to perfection!",
+        "price": 89.99
+    }
+)
+_PRODUCT_CATALOG_JSON = orjson.dumps(_PRODUCT_CATALOG).decode()
+
 
 class ProductManagementAgent:
     """
@@ -32,25 +116,44 @@ class ProductManagementAgent:
     using the Agent2Agent (A2A) Protocol architecture
     """
     
-    def __init__(self):
+    def __init__(self, http_client: Optional[httpx.AsyncClient] = None):
         self.kernel = None
         self.agent = None
+        self.http_client = http_client
+        self._response_cache = LLMCache()
+        self._cache_namespace = ""
         self._initialize_agent()
     
     def _initialize_agent(self):
         """Initialize the enhanced product management agent with multiple specialized agents"""
         try:
+            from semantic_kernel import Kernel
+            from semantic_kernel.agents import ChatCompletionAgent
+            from semantic_kernel.connectors.ai.open_ai import AzureChatCompletion
+            from semantic_kernel.functions.kernel_function_decorator import kernel_function
+            
             # region Kernel Configuration
             self.kernel = Kernel()
             
             # region Chat Service Configuration
             service_id = "azure_openai_chat"
+            endpoint = "https://admin-mh2k31bc-eastus2.cognitiveservices.azure.com"
+            api_key = os.getenv("gpt_api_key")
+            api_version = "2024-12-01-preview"
+            deployment_name = "gpt-4.1"
+            # Answers are only reused for the same endpoint and deployment
+            self._cache_namespace = f"product_management_agent|{endpoint}|{deployment_name}"
+            
+            # Reuse the application's pooled HTTP client when one is available
+            async_client = create_azure_openai_client(endpoint, api_key, api_version, self.http_client)
+            
             chat_service = AzureChatCompletion(
                 service_id=service_id,
-                deployment_name="gpt-4.1",
-                endpoint="https://admin-mh2k31bc-eastus2.cognitiveservices.azure.com",
-                api_key=os.getenv("gpt_api_key"),
-                api_version="2024-12-01-preview"
+                deployment_name=deployment_name,
+                endpoint=endpoint,
+                api_key=api_key,
+                api_version=api_version,
+                async_client=async_client
             )
             
             self.kernel.add_service(chat_service)
@@ -72,55 +175,9 @@ class ProductManagementAgent:
                     question: Annotated[
                         str, 'Natural language query to retrieve products, e.g. "What kinds of paint rollers do you have in stock?"'
                     ],
-                ) -> list[dict[str, Any]]:
-                    try:
-                        # Simulate product retrieval based on the question
-                        # In a real implementation, this would query a database or external service
-                        product_dict = [
-                            {
-                                "id": "1",
-                                "name": "Eco-Friendly Paint Roller",
-                                "type": "Paint Roller",
-                                "description": "A high-quality, eco-friendly paint roller for smooth finishes.",
-                                "punchLine": "Roll with the best, paint with the rest!",
-                                "price": 15.99
-                            },
-                            {
-                                "id": "2",
-                                "name": "Premium Paint Brush Set",
-                                "type": "Paint Brush",
-                                "description": "A set of premium paint brushes for detailed work and fine finishes.",
-                                "punchLine": "Brush up your skills with our premium set!",
-                                "price": 25.49
-                            },
-                            {
-                                "id": "3",
-                                "name": "All-Purpose Paint Tray",
-                                "type": "Paint Tray",
-                                "description": "A durable paint tray suitable for all types of rollers and brushes.",
-                                "punchLine": "Tray it, paint it, love it!",
-                                "price": 9.99
-                            },
-                            {
-                                "id": "4",
-                                "name": "Standard Paint Roller",
-                                "type": "Paint Roller", 
-                                "description": "A reliable paint roller for smooth and even paint application.",
-                                "punchLine": "Standard quality, extraordinary results!",
-                                "price": 12.99
-                            },
-                            {
-                                "id": "5",
-                                "name": "Professional Paint Sprayer",
-                                "type": "Paint Sprayer",
-                                "description": "Professional-grade paint sprayer for large projects and smooth finishes.",
-                                "punchLine": "Spray your way to perfection!",
-                                "price": 89.99
-                            }
-                        ]
-                        return product_dict
-                    except Exception as e:
-                        return f'Product recommendation failed: {e!s}'
+                ) -> str:
+                    # The catalog is static, so hand back the JSON serialized at import time
+                    return _PRODUCT_CATALOG_JSON
 
             # endregion
             
@@ -185,56 +242,86 @@ class ProductManagementAgent:
             logger.info("Enhanced Product Management Agent initialized successfully with multiple specialized agents")
             
         except Exception as e:
-            logger.error(f"Failed to initialize enhanced product management agent: {e}")
+            logger.error("Failed to initialize enhanced product management agent: %s", e)
             raise
     
+    def _build_chat_history(self, message: str, conversation_history: list = None):
+        """Build the chat history for a user message and any prior conversation"""
+        from semantic_kernel.contents.chat_history import ChatHistory
+        
+        if not conversation_history:
+            # Fast path for stateless single-message requests
+            chat_history = ChatHistory()
+            chat_history.add_user_message(message)
+            return chat_history
+        
+        # Create chat history with tracing
+        with _span("create_chat_history") as history_span:
+            chat_history = ChatHistory()
+            history_span.set_attribute("history.entries_processed", len(conversation_history))
+            
+            # Add conversation history
+            add_by_role = {
+                "user": chat_history.add_user_message,
+                "assistant": chat_history.add_assistant_message,
+            }
+            for entry in conversation_history:
+                add_message = add_by_role.get(entry.get("role"))
+                if add_message is not None:
+                    add_message(entry.get("content", ""))
+            
+            # Add current user message
+            chat_history.add_user_message(message)
+        return chat_history
+    
+    def _cache_key(self, message: str, conversation_history: list = None) -> str:
+        """Response cache key for a message and its exact conversation"""
+        return LLMCache.make_key(
+            self._cache_namespace,
+            *LLMCache.history_parts(conversation_history),
+            message
+        )
+    
     async def process_message(self, message: str, conversation_history: list = None) -> str:
         """Process a user message using the enhanced multi-agent system with comprehensive observability"""
-        with tracer.start_as_current_span("process_user_message") as span:
+        # Serve repeated prompts from the response cache
+        cache_key = self._cache_key(message, conversation_history)
+        cached_response = self._response_cache.get(cache_key)
+        if cached_response is not None:
+            return cached_response
+        
+        with _span("process_user_message") as span:
             try:
                 # Set span attributes for observability
-                span.set_attribute("message.length", len(message))
-                span.set_attribute("message.content", message[:100])  # First 100 chars for debugging
-                span.set_attribute("conversation.history_length", len(conversation_history) if conversation_history else 0)
+                if _otel_enabled():
+                    span.set_attribute("message.length", len(message))
+                    span.set_attribute("message.content", message[:100])  # First 100 chars for debugging
+                    span.set_attribute("conversation.history_length", len(conversation_history) if conversation_history else 0)
                 start_time = time.time()
                 
-                # Create chat history with tracing
-                with tracer.start_as_current_span("create_chat_history") as history_span:
-                    chat_history = ChatHistory()
-                    
-                    # Add conversation history if provided
-                    if conversation_history:
-                        history_span.set_attribute("history.entries_processed", len(conversation_history))
-                        for entry in conversation_history:
-                            if entry.get("role") == "user":
-                                chat_history.add_user_message(entry.get("content", ""))
-                            elif entry.get("role") == "assistant":
-                                chat_history.add_assistant_message(entry.get("content", ""))
-                    
-                    # Add current user message
-                    chat_history.add_user_message(message)
+                chat_history = self._build_chat_history(message, conversation_history)
                 
                 # Process message with agent delegation tracing
-                with tracer.start_as_current_span("agent_delegation") as delegation_span:
+                with _span("agent_delegation") as delegation_span:
                     delegation_span.set_attribute("agent.type", "ProductManagerAgent")
                     delegation_span.set_attribute("agent.delegation_mode", "automatic")
                     
                     # Use the main agent to process the message
                     # The agent will automatically delegate to appropriate specialized agents
-                    response_messages = []
+                    # Only the final message is used, so don't hold on to intermediate ones
+                    last_response = None
                     message_count = 0
                     
                     async for response_msg in self.agent.invoke(chat_history):
-                        response_messages.append(response_msg)
+                        last_response = response_msg
                         message_count += 1
                     
                     delegation_span.set_attribute("agent.response_messages_count", message_count)
                 
                 # Process and format response
-                with tracer.start_as_current_span("format_response") as response_span:
-                    if response_messages and len(response_messages) > 0:
-                        # Get the last response from the agent
-                        last_response = response_messages[-1]
+                with _span("format_response") as response_span:
+                    if last_response is not None:
+                        # Use the last response from the agent
                         if hasattr(last_response, 'content') and last_response.content:
                             final_response = str(last_response.content)
                         else:
@@ -248,7 +335,8 @@ class ProductManagementAgent:
                         span.set_attribute("processing.time_seconds", processing_time)
                         span.set_attribute(PROCESSING_STATUS_ATTR, "success")
                         
-                        logger.info(f"Message processed successfully in {processing_time:.3f}s - Response length: {len(final_response)} chars")
+                        logger.info("Message processed successfully in %.3fs - Response length: %s chars", processing_time, len(final_response))
+                        self._response_cache.put(cache_key, final_response)
                         return final_response
                     else:
                         no_response_msg = "No response generated from the agent system."
@@ -262,17 +350,42 @@ class ProductManagementAgent:
                 span.set_attribute(PROCESSING_STATUS_ATTR, "error")
                 span.set_attribute("error.type", type(e).__name__)
                 
-                logger.error(f"Error processing message with enhanced agent: {e}", exc_info=True)
+                logger.error("Error processing message with enhanced agent: %s", e, exc_info=True)
                 error_response = f"I apologize, but I encountered an error while processing your request: {str(e)}. Please try again."
                 return error_response
 
+    
+    async def stream_message(self, message: str, conversation_history: list = None) -> AsyncIterator[str]:
+        """Process a user message like process_message, yielding the final answer's text as it is generated"""
+        cache_key = self._cache_key(message, conversation_history)
+        cached_response = self._response_cache.get(cache_key)
+        if cached_response is not None:
+            yield cached_response
+            return
+        
+        with _span("stream_user_message") as span:
+            if _otel_enabled():
+                span.set_attribute("message.length", len(message))
+                span.set_attribute("conversation.history_length", len(conversation_history) if conversation_history else 0)
+            
+            chat_history = self._build_chat_history(message, conversation_history)
+            
+            # Delegation to the specialized agents happens inside the stream;
+            # only text content is forwarded to the caller
+            chunks = []
+            async for chunk in self.agent.invoke_stream(chat_history):
+                content = getattr(chunk, 'content', None)
+                if content:
+                    text = str(content)
+                    chunks.append(text)
+                    yield text
+            
+            if chunks:
+                self._response_cache.put(cache_key, "".join(chunks))
 
-# Global instance
-enhanced_product_manager = None
 
+# Global instance
+@functools.lru_cache(maxsize=None)
 def get_enhanced_product_manager() -> ProductManagementAgent:
     """Get or create the global enhanced ProductManagementAgent instance"""
-    global enhanced_product_manager
-    if enhanced_product_manager is None:
-        enhanced_product_manager = ProductManagementAgent()
-    return enhanced_product_manager
\ No newline at end of file
+    return ProductManagementAgent()
\ No newline at end of file
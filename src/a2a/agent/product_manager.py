@@ -3,89 +3,50 @@ Product Management Agent for A2A Protocol
 This agent handles product-related queries using Semantic Kernel
 """
 
-import os
+import re
 import asyncio
-from typing import Optional, List, Dict, Any
+import functools
+from types import MappingProxyType
+from typing import Optional, List, Dict, Any, AsyncIterator
 from semantic_kernel import Kernel
-from semantic_kernel.connectors.ai.open_ai import AzureChatCompletion
+from semantic_kernel.connectors.ai.function_choice_behavior import FunctionChoiceBehavior
+from semantic_kernel.connectors.ai.open_ai import AzureChatCompletion, OpenAIChatPromptExecutionSettings
+from semantic_kernel.functions import KernelPlugin
 from semantic_kernel.functions.kernel_function_decorator import kernel_function
 from semantic_kernel.contents.chat_history import ChatHistory
 from semantic_kernel.contents.chat_message_content import ChatMessageContent, AuthorRole
 import logging
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+from .azure_config import get_azure_openai_config
+from .http_client import create_azure_openai_client
+from .llm_cache import LLMCache
+
 logger = logging.getLogger(__name__)
 
 
-class ProductManager:
-    """Product Management Agent using Semantic Kernel"""
-    
-    def __init__(self):
-        self.kernel = None
-        self._initialize_kernel()
-        
-    def _initialize_kernel(self):
-        """Initialize the Semantic Kernel with Azure OpenAI"""
-        try:
-            # Create kernel
-            self.kernel = Kernel()
-            
-            # Add Azure OpenAI Chat Completion service
-            service_id = "azure_openai_chat"
-            self.kernel.add_service(
-                AzureChatCompletion(
-                    service_id=service_id,
-                    deployment_name=os.getenv("gpt_deployment", "gpt-4.1"),
-                    endpoint=os.getenv("AZURE_OPENAI_ENDPOINT"),
-                    api_key=os.getenv("AZURE_OPENAI_KEY"),
-                    api_version=os.getenv("AZURE_OPENAI_API_VERSION", "2024-12-01-preview")
-                )
-            )
-            
-            # Add product management functions
-            self._add_product_functions()
-            
-            logger.info("Semantic Kernel initialized successfully")
-            
-        except Exception as e:
-            logger.error(f"Failed to initialize Semantic Kernel: {e}")
-            raise
-    
-    def _add_product_functions(self):
-        """Add product management functions to the kernel"""
-        
-        @kernel_function(
-            name="get_product_info",
-            description="Get detailed information about a specific product"
-        )
-        def get_product_info(product_name: str) -> str:
-            """Get product information"""
-            # This would typically query a database or API
-            # For demo purposes, return mock data
-            product_db = {
-                "standard paint roller": {
-                    "name": "Standard Paint Roller",
-                    "price": "$12.99",
-                    "description": "A reliable paint roller for smooth and even paint application.",
-                    "category": "Painting Tools",
-                    "in_stock": True,
-                    "features": ["9-inch roller", "Synthetic cover", "Ergonomic handle"]
-                },
-                "premium paint roller": {
-                    "name": "Premium Paint Roller",
-                    "price": "$24.99", 
-                    "description": "Professional-grade paint roller with superior finish quality.",
-                    "category": "Painting Tools",
-                    "in_stock": True,
-                    "features": ["12-inch roller", "Microfiber cover", "Anti-slip grip"]
-                }
-            }
-            
-            product_key = product_name.lower()
-            if product_key in product_db:
-                product = product_db[product_key]
-                return f"""
+# Mock product data. This would typically come from a database or API;
+# it is static, so lookups and formatted output are built once at import time
+_PRODUCT_DB = MappingProxyType({
+    "standard paint roller": {
+        "name": "Standard Paint Roller",
+        "price": "$12.99",
+        "description": "A reliable paint roller for smooth and even paint application.",
+        "category": "Painting Tools",
+        "in_stock": True,
+        "features": ["9-inch roller", "Synthetic cover", "Ergonomic handle"]
+    },
+    "premium paint roller": {
+        "name": "Premium Paint Roller",
+        "price": "$24.99", 
+        "description": "Professional-grade paint roller with superior finish quality.",
+        "category": "Painting Tools",
+        "in_stock": True,
+        "features": ["12-inch roller", "Microfiber cover", "Anti-slip grip"]
+    }
+})
+
+_PRODUCT_INFO_STR = MappingProxyType({
+    key: f"""
 Product: {product['name']}
 Price: {product['price']}
 Description: {product['description']}
@@ -93,49 +54,38 @@ Category: {product['category']}
 In Stock: {'Yes' if product['in_stock'] else 'No'}
 Features: {', '.join(product['features'])}
 """
-            else:
-                return f"Product '{product_name}' not found in our catalog."
-        
-        @kernel_function(
-            name="recommend_products", 
-            description="Recommend products based on customer preferences and budget"
-        )
-        def recommend_products(need: str, budget: str = "medium") -> str:
-            """Recommend products based on needs"""
-            recommendations = {
-                "painting": [
-                    "Standard Paint Roller - $12.99 (Great for beginners)",
-                    "Premium Paint Roller - $24.99 (Professional quality)",
-                    "Paint Brush Set - $19.99 (For detailed work)",
-                    "Drop Cloth - $8.99 (Protect your floors)"
-                ],
-                "kitchen": [
-                    "Kitchen Paint (Heat Resistant) - $34.99",
-                    "Cabinet Hardware - $15.99",
-                    "LED Under-Cabinet Lighting - $45.99"
-                ]
-            }
-            
-            need_key = need.lower()
-            for key in recommendations:
-                if key in need_key:
-                    products = recommendations[key]
-                    if budget.lower() == "low":
-                        products = products[:2]  # Show fewer options for low budget
-                    
-                    return f"Here are my recommendations for {need}:\n" + "\n".join(f"• {product}" for product in products)
-            
-            return f"I'd be happy to help with recommendations for {need}. Could you provide more specific details about what you're looking for?"
-        
-        @kernel_function(
-            name="enhance_product_description",
-            description="Create enhanced, marketing-friendly product descriptions"
-        )
-        def enhance_product_description(product_name: str, current_description: str = "") -> str:
-            """Enhance product descriptions with marketing appeal"""
-            
-            enhanced_descriptions = {
-                "standard paint roller": """
+    for key, product in _PRODUCT_DB.items()
+})
+
+_RECOMMENDATIONS = MappingProxyType({
+    "painting": (
+        "Standard Paint Roller - $12.99 (Great for beginners)",
+        "Premium Paint Roller - $24.99 (Professional quality)",
+        "Paint Brush Set - $19.99 (For detailed work)",
+        "Drop Cloth - $8.99 (Protect your floors)"
+    ),
+    "kitchen": (
+        "Kitchen Paint (Heat Resistant) - $34.99",
+        "Cabinet Hardware - $15.99",
+        "LED Under-Cabinet Lighting - $45.99"
+    )
+})
+
+# Pre-formatted bullet lists per keyword: (full list, low-budget list)
+_RECOMMENDATION_LINES = MappingProxyType({
+    key: (
+        "\n".join(f"• {product}" for product in products),
+        "\n".join(f"• {product}" for product in products[:2])  # Show fewer options for low budget
+    )
+    for key, products in _RECOMMENDATIONS.items()
+})
+
+# One alternation over all keywords, so matching a need is a single scan
+# however many keywords are added
+_RECOMMENDATION_KEYWORDS = re.compile("|".join(map(re.escape, _RECOMMENDATIONS)))
+
+_ENHANCED_DESCRIPTIONS = MappingProxyType({
+    "standard paint roller": """
 🎨 **Transform Your Space with the Standard Paint Roller**
 
 Discover the perfect balance of quality and affordability! Our Standard Paint Roller is designed for DIY enthusiasts and professionals alike who demand reliable performance without breaking the bank.
@@ -153,7 +103,7 @@ Don't let its affordable price fool you – this roller delivers professional re
 
 *Make every stroke count. Choose quality. Choose Standard.*
 """,
-                "premium paint roller": """
+    "premium paint roller": """
 🏆 **Elevate Your Craft with the Premium Paint Roller**
 
 Step into the professional league with our Premium Paint Roller – where superior engineering meets exceptional results. Designed for those who accept nothing less than perfection.
@@ -171,31 +121,147 @@ When your reputation depends on results, choose the roller that professionals tr
 
 *Because excellence isn't an accident. It's a choice.*
 """
-            }
-            
-            product_key = product_name.lower()
-            if product_key in enhanced_descriptions:
-                return enhanced_descriptions[product_key]
-            else:
-                return f"Enhanced description for {product_name}: A high-quality product designed to meet your needs with excellent performance and reliability. Contact us for more details!"
+})
+
+_SYSTEM_PROMPT = """You are a helpful Product Management Assistant for Zava, a home improvement store. 
+You have access to product information, can make recommendations, and can enhance product descriptions.
+
+Use the available functions when appropriate:
+- get_product_info: When users ask about specific products
+- recommend_products: When users need product suggestions
+- enhance_product_description: When users want improved product descriptions
+
+Always be helpful, friendly, and focused on providing value to customers."""
+
+
+# Product management functions, defined and decorated once at import time
+@kernel_function(
+    name="get_product_info",
+    description="Get detailed information about a specific product"
+)
+def get_product_info(product_name: str) -> str:
+    """Get product information"""
+    product_info = _PRODUCT_INFO_STR.get(product_name.lower())
+    if product_info is not None:
+        return product_info
+    return f"Product '{product_name}' not found in our catalog."
+
+
+@kernel_function(
+    name="recommend_products", 
+    description="Recommend products based on customer preferences and budget"
+)
+def recommend_products(need: str, budget: str = "medium") -> str:
+    """Recommend products based on needs"""
+    # Find every keyword in one scan, then pick by _RECOMMENDATIONS order
+    # rather than position in the text, e.g. "kitchen painting" -> painting
+    matches = set(_RECOMMENDATION_KEYWORDS.findall(need.lower()))
+    key = next((key for key in _RECOMMENDATIONS if key in matches), None)
+    if key is not None:
+        all_lines, low_budget_lines = _RECOMMENDATION_LINES[key]
+        lines = low_budget_lines if budget.lower() == "low" else all_lines
+        return f"Here are my recommendations for {need}:\n" + lines
+    
+    return f"I'd be happy to help with recommendations for {need}. Could you provide more specific details about what you're looking for?"
+
+
+@kernel_function(
+    name="enhance_product_description",
+    description="Create enhanced, marketing-friendly product descriptions"
+)
+def enhance_product_description(product_name: str, current_description: str = "") -> str:
+    """Enhance product descriptions with marketing appeal"""
+    enhanced_description = _ENHANCED_DESCRIPTIONS.get(product_name.lower())
+    if enhanced_description is not None:
+        return enhanced_description
+    return f"Enhanced description for {product_name}: A high-quality product designed to meet your needs with excellent performance and reliability. Contact us for more details!"
+
+
+@functools.cache
+def _get_chat_service() -> AzureChatCompletion:
+    """Create the Azure OpenAI chat service once so instances share its connection pool"""
+    cfg = get_azure_openai_config()
+    return AzureChatCompletion(
+        service_id="azure_openai_chat",
+        deployment_name=cfg.deployment,
+        endpoint=cfg.endpoint,
+        api_key=cfg.api_key,
+        api_version=cfg.api_version,
+        async_client=create_azure_openai_client(cfg.endpoint, cfg.api_key, cfg.api_version)
+    )
+
+
+@functools.cache
+def _get_product_plugin() -> KernelPlugin:
+    """Build the ProductManager plugin once and share it across kernels"""
+    return KernelPlugin(
+        name="ProductManager",
+        functions=[get_product_info, recommend_products, enhance_product_description]
+    )
+
+
+class ProductManager:
+    """Product Management Agent using Semantic Kernel"""
+    
+    def __init__(self):
+        self.kernel = None
+        self._chat_completion = None
+        # The system prompt is constant, so every request shares one message
+        self._system_message = ChatMessageContent(role=AuthorRole.SYSTEM, content=_SYSTEM_PROMPT)
+        self._response_cache = LLMCache()
+        self._initialize_kernel()
         
-        # Add functions to kernel
-        self.kernel.add_function(
-            plugin_name="ProductManager",
-            function=get_product_info
-        )
-        self.kernel.add_function(
-            plugin_name="ProductManager", 
-            function=recommend_products
-        )
-        self.kernel.add_function(
-            plugin_name="ProductManager",
-            function=enhance_product_description
-        )
+    def _initialize_kernel(self):
+        """Initialize the Semantic Kernel with Azure OpenAI"""
+        try:
+            # Create kernel
+            self.kernel = Kernel()
+            
+            # Add Azure OpenAI Chat Completion service, keeping a reference
+            # so requests don't look it up in the kernel's registry
+            self._chat_completion = _get_chat_service()
+            self.kernel.add_service(self._chat_completion)
+            
+            # Add product management functions
+            self.kernel.add_plugin(_get_product_plugin())
+            
+            # Let the model call the product functions, several per turn if it
+            # wants to. Semantic Kernel invokes the tool calls from one turn
+            # concurrently, and our functions are pure so they are safe to overlap
+            self._execution_settings = OpenAIChatPromptExecutionSettings(
+                function_choice_behavior=FunctionChoiceBehavior.Auto(),
+                parallel_tool_calls=True
+            )
+            
+            logger.info("Semantic Kernel initialized successfully")
+            
+        except Exception as e:
+            logger.error("Failed to initialize Semantic Kernel: %s", e)
+            raise
     
     async def process_message(self, message: str, conversation_history: List[Dict] = None) -> str:
         """Process a user message and return a response"""
+        # Buffered fallback for callers that need the whole reply at once
+        response = "".join([chunk async for chunk in self.stream_message(message, conversation_history)])
+        return response or "No response generated"
+    
+    async def stream_message(self, message: str, conversation_history: List[Dict] = None) -> AsyncIterator[str]:
+        """Process a user message and yield the response as it is generated"""
         try:
+            # Serve repeated prompts from the response cache; the key covers the
+            # deployment and tool settings as well as the exact conversation
+            cache_key = LLMCache.make_key(
+                "product_manager",
+                get_azure_openai_config().deployment or "",
+                "tools=auto,parallel",
+                *LLMCache.history_parts(conversation_history),
+                message
+            )
+            cached_response = self._response_cache.get(cache_key)
+            if cached_response is not None:
+                yield cached_response
+                return
+            
             # Create chat history
             chat_history = ChatHistory()
             
@@ -209,43 +275,33 @@ When your reputation depends on results, choose the roller that professionals tr
                     ))
             
             # Add system message to set context
-            system_message = """You are a helpful Product Management Assistant for Zava, a home improvement store. 
-You have access to product information, can make recommendations, and can enhance product descriptions.
-
-Use the available functions when appropriate:
-- get_product_info: When users ask about specific products
-- recommend_products: When users need product suggestions
-- enhance_product_description: When users want improved product descriptions
-
-Always be helpful, friendly, and focused on providing value to customers."""
-
-            chat_history.add_system_message(system_message)
+            chat_history.add_message(self._system_message)
             
             # Add current user message
             chat_history.add_user_message(message)
             
-            # Get chat completion service
-            chat_completion = self.kernel.get_service(type=AzureChatCompletion)
-            
-            # Generate response using the kernel with function calling
-            response = await chat_completion.get_chat_message_content(
+            # Stream the response using the kernel with function calling; tool
+            # call chunks carry no text and are skipped
+            chunks = []
+            async for chunk in self._chat_completion.get_streaming_chat_message_content(
                 chat_history=chat_history,
+                settings=self._execution_settings,
                 kernel=self.kernel
-            )
+            ):
+                if chunk and chunk.content:
+                    text = str(chunk.content)
+                    chunks.append(text)
+                    yield text
             
-            return str(response.content) if response and response.content else "No response generated"
+            if chunks:
+                self._response_cache.put(cache_key, "".join(chunks))
             
         except Exception as e:
-            logger.error(f"Error processing message: {e}", exc_info=True)
-            return f"I apologize, but I encountered an error while processing your request: {str(e)}. Please try again."
-
+            logger.error("Error processing message: %s", e, exc_info=True)
+            yield f"I apologize, but I encountered an error while processing your request: {str(e)}. Please try again."
 
 # Global instance
-product_manager = None
-
+@functools.lru_cache(maxsize=None)
 def get_product_manager() -> ProductManager:
     """Get or create the global ProductManager instance"""
-    global product_manager
-    if product_manager is None:
-        product_manager = ProductManager()
-    return product_manager
\ No newline at end of file
+    return ProductManager()
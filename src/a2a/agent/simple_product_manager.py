@@ -2,25 +2,36 @@
 Simple Product Manager for testing Semantic Kernel basic functionality
 """
 
-import os
 import asyncio
-from typing import Optional
+import functools
+from typing import Optional, AsyncIterator
 from semantic_kernel import Kernel
 from semantic_kernel.connectors.ai.open_ai import AzureChatCompletion, OpenAIChatPromptExecutionSettings
 from semantic_kernel.contents.chat_history import ChatHistory
 from semantic_kernel.contents.chat_message_content import ChatMessageContent, AuthorRole
 import logging
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+from .azure_config import get_gpt_config
+from .http_client import create_azure_openai_client
+from .llm_cache import LLMCache
+from .prompts import PRODUCT_ASSISTANT_PROMPT
+
 logger = logging.getLogger(__name__)
 
+# Generation settings, also part of the response cache key
+_MAX_COMPLETION_TOKENS = 1000
+_TEMPERATURE = 0.7
+
 
 class SimpleProductManager:
     """Simple Product Manager without function calling for testing"""
     
     def __init__(self):
         self.kernel = None
+        self._chat_completion = None
+        # The system prompt is constant, so every request shares one message
+        self._system_message = ChatMessageContent(role=AuthorRole.SYSTEM, content=PRODUCT_ASSISTANT_PROMPT)
+        self._response_cache = LLMCache()
         self._initialize_kernel()
     
     def _initialize_kernel(self):
@@ -31,70 +42,83 @@ class SimpleProductManager:
             # Add Azure OpenAI Chat Completion service using the correct GPT-4.1 endpoint
             service_id = "azure_openai_chat"
             
-            # Use the correct base endpoint for GPT-4.1 (without the deployment path)
-            gpt_endpoint = "https://admin-mh2k31bc-eastus2.cognitiveservices.azure.com"
+            cfg = get_gpt_config()
+            
+            # Keep a reference so requests don't look it up in the kernel's registry
+            self._chat_completion = AzureChatCompletion(
+                service_id=service_id,
+                deployment_name=cfg.deployment,
+                endpoint=cfg.endpoint,
+                api_key=cfg.api_key,
+                api_version=cfg.api_version,
+                # Share the application's pooled HTTP client when one is registered
+                async_client=create_azure_openai_client(cfg.endpoint, cfg.api_key, cfg.api_version)
+            )
+            self.kernel.add_service(self._chat_completion)
             
-            self.kernel.add_service(
-                AzureChatCompletion(
-                    service_id=service_id,
-                    deployment_name=os.getenv("gpt_deployment", "gpt-4.1"),
-                    endpoint=gpt_endpoint,
-                    api_key=os.getenv("gpt_api_key"),
-                    api_version=os.getenv("gpt_api_version", "2024-12-01-preview")
-                )
+            # Generate responses with proper settings
+            self._execution_settings = OpenAIChatPromptExecutionSettings(
+                max_completion_tokens=_MAX_COMPLETION_TOKENS,
+                temperature=_TEMPERATURE
             )
             
             logger.info("Simple Semantic Kernel initialized successfully")
             
         except Exception as e:
-            logger.error(f"Failed to initialize Semantic Kernel: {e}", exc_info=True)
+            logger.error("Failed to initialize Semantic Kernel: %s", e, exc_info=True)
             raise
     
     async def process_simple_message(self, message: str) -> str:
         """Process a message using basic Semantic Kernel functionality"""
+        # Buffered fallback for callers that need the whole reply at once
+        response = "".join([chunk async for chunk in self.stream_simple_message(message)])
+        return response or "No response generated"
+    
+    async def stream_simple_message(self, message: str) -> AsyncIterator[str]:
+        """Process a message and yield the response as it is generated"""
         try:
-            logger.info(f"Processing simple message: {message[:50]}...")
+            logger.info("Processing simple message: %s...", message[:50])
+            
+            # Serve repeated prompts from the response cache
+            cache_key = LLMCache.make_key(
+                "simple_product_manager",
+                get_gpt_config().deployment or "",
+                f"max_completion_tokens={_MAX_COMPLETION_TOKENS},temperature={_TEMPERATURE}",
+                message
+            )
+            cached_response = self._response_cache.get(cache_key)
+            if cached_response is not None:
+                yield cached_response
+                return
             
             # Create chat history
             chat_history = ChatHistory()
             
             # Add system message
-            system_message = """You are a helpful Product Management Assistant for Zava, a home improvement store. 
-You help customers with product information, recommendations, and general inquiries about home improvement products.
-Be friendly, helpful, and knowledgeable about home improvement and furniture products."""
-            
-            chat_history.add_system_message(system_message)
+            chat_history.add_message(self._system_message)
             chat_history.add_user_message(message)
             
-            # Get chat completion service
-            chat_completion = self.kernel.get_service(type=AzureChatCompletion)
-            
-            # Generate response with proper settings
-            settings = OpenAIChatPromptExecutionSettings(
-                max_completion_tokens=1000,
-                temperature=0.7
-            )
-            
-            response = await chat_completion.get_chat_message_content(
+            chunks = []
+            async for chunk in self._chat_completion.get_streaming_chat_message_content(
                 chat_history=chat_history,
-                settings=settings
-            )
+                settings=self._execution_settings
+            ):
+                if chunk and chunk.content:
+                    text = str(chunk.content)
+                    chunks.append(text)
+                    yield text
             
-            result = str(response.content) if response and response.content else "No response generated"
-            logger.info(f"Generated response: {result[:50]}...")
-            return result
+            if chunks:
+                result = "".join(chunks)
+                self._response_cache.put(cache_key, result)
+                logger.info("Generated response: %s...", result[:50])
             
         except Exception as e:
-            logger.error(f"Error processing simple message: {e}", exc_info=True)
-            return f"I apologize, but I encountered an error: {str(e)}. Please try again."
-
+            logger.error("Error processing simple message: %s", e, exc_info=True)
+            yield f"I apologize, but I encountered an error: {str(e)}. Please try again."
 
 # Global instance
-simple_product_manager = None
-
+@functools.lru_cache(maxsize=None)
 def get_simple_product_manager() -> SimpleProductManager:
     """Get or create the global SimpleProductManager instance"""
-    global simple_product_manager
-    if simple_product_manager is None:
-        simple_product_manager = SimpleProductManager()
-    return simple_product_manager
\ No newline at end of file
+    return SimpleProductManager()
@@ -4,10 +4,14 @@ Handles chat requests and interfaces with the agent executor
 """
 
 import logging
+import orjson
+from types import MappingProxyType
 from typing import Dict, Any, Optional
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel, Field
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field
 
+from ..agent.batch_dispatcher import get_batch_dispatcher
 from ..agent.executor import get_agent_executor
 
 # Configure logging
@@ -16,35 +20,54 @@ logger = logging.getLogger(__name__)
 # Create router
 router = APIRouter(tags=["chat"])
 
-# Global agent executor (will be initialized on first use)
-agent_executor = None
+# Shared read-only stand-in for requests that carry no metadata
+_EMPTY_METADATA = MappingProxyType({})
+
+# Static agent description, serialized once at import time
+_AGENT_INFO_BYTES = orjson.dumps({
+    "agent_id": "zava-product-manager",
+    "name": "Zava Product Manager",
+    "description": "A specialized agent for managing Zava product information, recommendations, and enhanced descriptions",
+    "version": "1.0.0",
+    "capabilities": [
+        "Product Information Retrieval",
+        "Product Recommendations", 
+        "Enhanced Product Descriptions",
+        "Inventory Queries",
+        "Customer Support"
+    ],
+    "supported_languages": ["en"],
+    "response_formats": ["text", "json"]
+})
 
 def get_or_create_agent_executor():
     """Get the agent executor, creating it if necessary"""
-    global agent_executor
-    if agent_executor is None:
-        agent_executor = get_agent_executor()
-    return agent_executor
+    # The app lifespan creates it before serving; the accessor is memoized either way
+    return get_agent_executor()
 
 
 class ChatRequest(BaseModel):
     """Request model for chat messages"""
+    model_config = ConfigDict(extra="ignore")
+    
     message: str = Field(..., description="The user message")
     session_id: Optional[str] = Field(None, description="Optional session ID for context")
     conversation_id: Optional[str] = Field(None, description="Optional conversation ID for context")
-    metadata: Optional[Dict[str, Any]] = Field(default_factory=dict, description="Additional metadata")
+    metadata: Optional[Dict[str, Any]] = Field(None, description="Additional metadata")
 
 
 class ChatResponse(BaseModel):
     """Response model for chat messages"""
+    model_config = ConfigDict(extra="ignore")
+    
     response: str = Field(..., description="The agent's response")
     execution_id: str = Field(..., description="The execution ID for tracking")
     status: str = Field(..., description="The execution status")
-    metadata: Optional[Dict[str, Any]] = Field(default_factory=dict, description="Additional metadata")
+    metadata: Optional[Dict[str, Any]] = Field(None, description="Additional metadata")
 
 
 @router.post("/chat/message", response_model=ChatResponse)
-async def chat_with_agent(request: ChatRequest):
+async def chat_with_agent(request: ChatRequest, response: Response):
     """
     Send a message to the Product Manager agent
     
@@ -52,20 +75,42 @@ async def chat_with_agent(request: ChatRequest):
         request: Chat request containing message and optional metadata
         
     Returns:
-        ChatResponse with agent's response and execution details
+        ChatResponse with agent's response and execution details. Batch
+        requests return 202 with a pending execution to poll via /chat/status.
     """
     try:
-        logger.info(f"Received chat request: {request.message[:100]}...")
+        logger.info("Received chat request: %s...", request.message[:100])
+        
+        metadata = request.metadata or _EMPTY_METADATA
         
         # Prepare execution request
         execution_request = {
             "message": request.message,
             "conversation_id": request.conversation_id or request.session_id,
-            "metadata": request.metadata or {}
+            "metadata": metadata
         }
         
-        # Execute the request
         executor = get_or_create_agent_executor()
+        
+        # Non-interactive callers can opt in to the higher-throughput Batch API.
+        # Batch jobs complete within hours, not seconds, so the request is
+        # tracked as a background execution and its result polled via /chat/status
+        if metadata.get("batch"):
+            try:
+                dispatcher = get_batch_dispatcher()
+            except RuntimeError as e:
+                raise HTTPException(status_code=503, detail=str(e))
+            
+            execution_id = executor.submit(execution_request, process=dispatcher.submit)
+            response.status_code = 202
+            return ChatResponse(
+                response="",
+                execution_id=execution_id,
+                status="pending",
+                metadata={"batch": True}
+            )
+        
+        # Execute the request
         result = await executor.execute(execution_request)
         
         # Extract response from result
@@ -79,17 +124,56 @@ async def chat_with_agent(request: ChatRequest):
             response=response_text,
             execution_id=result.get("execution_id", ""),
             status="completed" if result.get("status") == "success" else result.get("status", "unknown"),
-            metadata=result.get("metadata", {})
+            metadata=result.get("metadata")
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Error in chat endpoint: {e}")
+        logger.error("Error in chat endpoint: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Chat processing failed: {str(e)}"
         )
 
 
+
+@router.post("/chat/stream")
+async def stream_chat_with_agent(request: ChatRequest):
+    """
+    Send a message to the Product Manager agent and stream the reply
+    
+    Uses the same agent and execution tracking as /chat/message, so the
+    execution can be polled via /chat/status or stopped via /chat/cancel.
+    
+    Args:
+        request: Chat request containing message and optional metadata
+        
+    Returns:
+        Server-sent events: an execution event carrying the execution ID,
+        JSON-encoded text chunks, then a done event
+    """
+    logger.info("Received streaming chat request: %s...", request.message[:100])
+    
+    execution_request = {
+        "message": request.message,
+        "conversation_id": request.conversation_id or request.session_id,
+        "metadata": request.metadata or _EMPTY_METADATA
+    }
+    execution_id, chunks = get_or_create_agent_executor().stream(execution_request)
+    
+    async def event_stream():
+        yield b"event: execution\ndata: " + orjson.dumps({"execution_id": execution_id}) + b"\n\n"
+        async for chunk in chunks:
+            yield b"data: " + orjson.dumps(chunk) + b"\n\n"
+        yield b"event: done\ndata: {}\n\n"
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"X-Execution-ID": execution_id}
+    )
+
 @router.get("/chat/status/{execution_id}")
 async def get_chat_status(execution_id: str):
     """
@@ -113,7 +197,7 @@ async def get_chat_status(execution_id: str):
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error getting chat status: {e}")
+        logger.error("Error getting chat status: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Status retrieval failed: {str(e)}"
@@ -143,7 +227,7 @@ async def cancel_chat_execution(execution_id: str):
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error cancelling chat execution: {e}")
+        logger.error("Error cancelling chat execution: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Cancellation failed: {str(e)}"
@@ -161,10 +245,11 @@ async def list_chat_executions():
     try:
         executor = get_or_create_agent_executor()
         executions = executor.list_executions()
-        return {"executions": executions}
+        # Serialize the shared summaries directly instead of letting FastAPI deep-copy them
+        return ORJSONResponse({"executions": executions})
         
     except Exception as e:
-        logger.error(f"Error listing chat executions: {e}")
+        logger.error("Error listing chat executions: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Listing executions failed: {str(e)}"
@@ -179,18 +264,4 @@ async def get_agent_info():
     Returns:
         Agent capabilities and information
     """
-    return {
-        "agent_id": "zava-product-manager",
-        "name": "Zava Product Manager",
-        "description": "A specialized agent for managing Zava product information, recommendations, and enhanced descriptions",
-        "version": "1.0.0",
-        "capabilities": [
-            "Product Information Retrieval",
-            "Product Recommendations", 
-            "Enhanced Product Descriptions",
-            "Inventory Queries",
-            "Customer Support"
-        ],
-        "supported_languages": ["en"],
-        "response_formats": ["text", "json"]
-    }
\ No newline at end of file
+    return Response(_AGENT_INFO_BYTES, media_type="application/json")
@@ -4,49 +4,63 @@ from contextlib import asynccontextmanager
 from pathlib import Path
 
 import httpx
+import orjson
 from fastapi import FastAPI, Request
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse, Response
 from dotenv import load_dotenv
 from opentelemetry import trace
 from azure.monitor.opentelemetry import configure_azure_monitor
 from opentelemetry.instrumentation.openai_v2 import OpenAIInstrumentor
+from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
 
 from a2a.api.chat import router as chat_router
-from a2a.agent.a2a_server import A2AServer
+from a2a.agent.a2a_server import A2A_MOUNT_PATH, A2AServer
+from a2a.agent.http_client import create_http_client
 
 # Load environment variables early
 load_dotenv()
 
-# Configure Azure Monitor for observability
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Paths left out of request tracing; health probes stay as cheap as possible
+_TRACE_EXCLUDED_URLS = "health"
+
+# configure_azure_monitor instruments FastAPI itself and reads its exclusions
+# from the environment, so they have to be in place before it runs
+os.environ.setdefault("OTEL_PYTHON_FASTAPI_EXCLUDED_URLS", _TRACE_EXCLUDED_URLS)
+
+# Configure Azure Monitor for observability. This module can be imported twice
+# in one process (as __main__ and as a2a.main), so skip it if a tracer
+# provider is already installed.
 try:
     application_insights_connection_string = os.environ.get("APPLICATIONINSIGHTS_CONNECTION_STRING")
-    if application_insights_connection_string:
+    if not isinstance(trace.get_tracer_provider(), trace.ProxyTracerProvider):
+        logging.info("Azure Monitor observability already configured")
+    elif application_insights_connection_string:
         configure_azure_monitor(connection_string=application_insights_connection_string)
         logging.info("Azure Monitor observability configured successfully")
     else:
         logging.warning("APPLICATIONINSIGHTS_CONNECTION_STRING not found - Azure Monitor not configured")
 except Exception as e:
-    logging.error(f"Failed to configure Azure Monitor: {e}")
+    logging.error("Failed to configure Azure Monitor: %s", e)
 
 # Configure OpenAI instrumentation for AI model request tracing
 try:
-    OpenAIInstrumentor().instrument()
-    logging.info("OpenAI instrumentation configured successfully")
+    if not OpenAIInstrumentor().is_instrumented_by_opentelemetry:
+        OpenAIInstrumentor().instrument()
+        logging.info("OpenAI instrumentation configured successfully")
 except Exception as e:
-    logging.error(f"Failed to configure OpenAI instrumentation: {e}")
+    logging.error("Failed to configure OpenAI instrumentation: %s", e)
 
 # Initialize OpenTelemetry tracer
 tracer = trace.get_tracer(__name__)
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
-
-# Constants for telemetry attributes
-HTTP_METHOD_ATTR = "http.method"
-HTTP_ROUTE_ATTR = "http.route"
+# Health probe payload never changes, so serialize it once
+_HEALTH_BYTES = orjson.dumps({"status": "healthy", "service": "zava-product-manager"})
 
 # Global variables for cleanup
 httpx_client: httpx.AsyncClient = None
@@ -64,7 +78,8 @@ async def lifespan(app: FastAPI):
         startup_span.set_attribute("service.name", "zava-product-manager")
         startup_span.set_attribute("service.version", "1.0.0")
         
-        httpx_client = httpx.AsyncClient(timeout=30)
+        # Shared pooled client for the A2A server and the agent's Azure OpenAI calls
+        httpx_client = create_http_client()
         
         # Initialize A2A server
         host = os.getenv("HOST", "0.0.0.0")
@@ -76,11 +91,11 @@ async def lifespan(app: FastAPI):
         a2a_server = A2AServer(httpx_client, host=host, port=port)
         
         # Mount A2A endpoints to the main app
-        app.mount("/a2a", a2a_server.get_starlette_app(), name="a2a")
+        app.mount(A2A_MOUNT_PATH, a2a_server.get_starlette_app(), name="a2a")
         
         logger.info(
-            f"A2A server mounted at / - Agent Card available at "
-            f"http://{host}:{port}/agent-card/"
+            "A2A server mounted at / - Agent Card available at "
+            "http://%s:%s/agent-card/", host, port
         )
         startup_span.set_attribute("startup.status", "success")
     
@@ -101,9 +116,15 @@ app = FastAPI(
         "A standalone web application for Zava Product Manager"
     ),
     version="1.0.0",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
+# Route spans are created by the ASGI instrumentation rather than per handler.
+# This must happen before startup, since middleware can't be added once the app
+# is running. Apps already instrumented by configure_azure_monitor are skipped.
+FastAPIInstrumentor.instrument_app(app, excluded_urls=_TRACE_EXCLUDED_URLS)
+
 # Mount static files
 static_path = Path(__file__).parent / "static"
 app.mount("/static", StaticFiles(directory=static_path), name="static")
@@ -111,6 +132,10 @@ app.mount("/static", StaticFiles(directory=static_path), name="static")
 # Setup templates
 templates_path = Path(__file__).parent / "templates"
 templates = Jinja2Templates(directory=templates_path)
+templates.env.auto_reload = False
+
+# index.html takes no per-request variables, so render it once and skip Jinja per request
+_INDEX_HTML = templates.get_template("index.html").render()
 
 # Include API routes
 app.include_router(chat_router, prefix="/api")
@@ -119,35 +144,22 @@ app.include_router(chat_router, prefix="/api")
 @app.get("/", response_class=HTMLResponse)
 async def read_root(request: Request):
     """Serve the main chat interface"""
-    with tracer.start_as_current_span("serve_chat_interface") as span:
-        span.set_attribute(HTTP_METHOD_ATTR, "GET")
-        span.set_attribute(HTTP_ROUTE_ATTR, "/")
-        return templates.TemplateResponse("index.html", {"request": request})
+    return HTMLResponse(_INDEX_HTML)
 
 
 @app.get("/health")
 async def health_check():
     """Health check endpoint for Azure App Service"""
-    with tracer.start_as_current_span("health_check") as span:
-        span.set_attribute(HTTP_METHOD_ATTR, "GET")
-        span.set_attribute(HTTP_ROUTE_ATTR, "/health")
-        result = {"status": "healthy", "service": "zava-product-manager"}
-        span.set_attribute("health.status", result["status"])
-        return result
+    return Response(_HEALTH_BYTES, media_type="application/json")
 
 
 @app.get("/agent-card")
 async def get_agent_card():
     """Expose the A2A Agent Card for discovery"""
-    with tracer.start_as_current_span("get_agent_card") as span:
-        span.set_attribute(HTTP_METHOD_ATTR, "GET")
-        span.set_attribute(HTTP_ROUTE_ATTR, "/agent-card")
-        if a2a_server:
-            result = a2a_server._get_agent_card()
-            span.set_attribute("agent_card.available", True)
-            return result
-        span.set_attribute("agent_card.available", False)
-        return {"error": "A2A server not initialized"}
+    if a2a_server:
+        # Serve the pre-serialized card; its capabilities are read-only mappings
+        return Response(a2a_server._agent_card_bytes, media_type="application/json")
+    return {"error": "A2A server not initialized"}
 
 
 if __name__ == "__main__":
@@ -156,5 +168,22 @@ if __name__ == "__main__":
     host = os.getenv("HOST", "0.0.0.0")
     port = int(os.getenv("PORT", 8001))
     debug = os.getenv("DEBUG", "false").lower() == "true"
+    # One process by default: execution state (the ExecutionStore, summaries
+    # and background tasks) lives in memory per process, so with several
+    # workers /submit, /status and /cancel calls can land on a process that
+    # never saw the execution. Set WEB_CONCURRENCY only for deployments that
+    # don't rely on execution tracking. Reload mode only supports one process.
+    workers = 1 if debug else int(os.getenv("WEB_CONCURRENCY", 1))
     
-    uvicorn.run(app, host=host, port=port, reload=debug)
+    # Reload and multiple workers need the import string so each process can
+    # import the app; a single process serves this app object directly rather
+    # than importing the module a second time as a2a.main
+    uvicorn.run(
+        "a2a.main:app" if debug or workers > 1 else app,
+        host=host,
+        port=port,
+        reload=debug,
+        workers=workers,
+        loop="uvloop",
+        http="httptools"
+    )
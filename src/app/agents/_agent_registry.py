@@ -0,0 +1,32 @@
+"""
+Agent lookup shared by the agent initializers.
+
+The agent listing is paged over HTTP, so pages are fetched only until the
+requested name turns up, and what has been seen is reused by every
+initializer that runs in the same process.
+"""
+from typing import Any, Dict, Iterator, Optional
+
+_agents_by_endpoint: Dict[str, Dict[str, Any]] = {}
+_pages_by_endpoint: Dict[str, Optional[Iterator]] = {}
+
+
+def get_agent_by_name(project_client, endpoint: str, name: str) -> Optional[Any]:
+    """Find an existing agent by name, or None if the project has none."""
+    agents = _agents_by_endpoint.setdefault(endpoint, {})
+    if endpoint not in _pages_by_endpoint:
+        # The service has no name filter, so walk the listing a page at a time
+        _pages_by_endpoint[endpoint] = project_client.agents.list_agents().by_page()
+
+    pages = _pages_by_endpoint[endpoint]
+    while name not in agents and pages is not None:
+        page = next(pages, None)
+        if page is None:
+            # Listing exhausted; everything the project has is now in agents
+            _pages_by_endpoint[endpoint] = pages = None
+            break
+        for agent in page:
+            # Keep the first match for a name, as the original scan did
+            agents.setdefault(agent.name, agent)
+
+    return agents.get(name)
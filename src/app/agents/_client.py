@@ -0,0 +1,28 @@
+"""
+Azure AI project client shared by the agent initializers.
+"""
+import atexit
+import os
+from functools import lru_cache
+import requests
+from azure.ai.projects import AIProjectClient
+from azure.core.pipeline.transport import RequestsTransport
+from azure.identity import DefaultAzureCredential
+
+
+# Built on first use rather than at import, so the initializers' load_dotenv()
+# has run by the time the endpoint is read
+@lru_cache(maxsize=1)
+def get_project_client() -> AIProjectClient:
+    """Get the process-wide project client.
+
+    One credential serves every initializer's calls from its token cache, and
+    the requests session keeps the TLS connection alive between them.
+    """
+    project_client = AIProjectClient(
+        endpoint=os.environ["AZURE_AI_AGENT_ENDPOINT"],
+        credential=DefaultAzureCredential(),
+        transport=RequestsTransport(session=requests.Session()),
+    )
+    atexit.register(project_client.close)
+    return project_client
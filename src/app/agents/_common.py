@@ -0,0 +1,144 @@
+"""
+Create-or-update logic shared by the agent initializers.
+"""
+import json
+import os
+from pathlib import Path
+from typing import Optional
+from azure.core.exceptions import ResourceNotFoundError
+from azure.ai.agents.models import ToolSet
+from utils.paths import VERIFY_CACHE_FILE, load_prompt
+from app.agents._agent_registry import get_agent_by_name
+from app.agents._client import get_project_client
+
+# Agent IDs remembered between runs so the full agent listing can be skipped
+AGENT_CACHE_DIR = Path(__file__).resolve().parent / '.agent_cache'
+
+
+def _read_cached_agent_id(cache_file: Path) -> Optional[str]:
+    try:
+        return json.loads(cache_file.read_text(encoding='utf-8')).get("agent_id")
+    except (OSError, ValueError):
+        return None
+
+
+def _write_cached_agent_id(cache_file: Path, agent_id: str) -> None:
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    cache_file.write_text(json.dumps({"agent_id": agent_id}), encoding='utf-8')
+
+
+def ensure_agent(name: str, prompt_name: str, toolset: Optional[ToolSet] = None, cache_key: Optional[str] = None):
+    """
+    Create the named agent, or update it in place if it already exists.
+
+    Args:
+        name: Agent name, used to find an existing agent
+        prompt_name: File in the prompts directory holding the agent instructions
+        toolset: Tools to attach to the agent, if any
+        cache_key: If set, remember the agent ID under this key between runs
+
+    Returns:
+        The created or updated agent
+    """
+    project_endpoint = os.environ["AZURE_AI_AGENT_ENDPOINT"]
+    model = os.environ["AZURE_AI_AGENT_MODEL_DEPLOYMENT_NAME"]
+    instructions = load_prompt(prompt_name)
+
+    project_client = get_project_client()
+    if toolset is not None:
+        project_client.agents.enable_auto_function_calls(tools=toolset)
+
+    existing_agent = None
+    cache_file = AGENT_CACHE_DIR / f"{cache_key}.json" if cache_key else None
+
+    # Look up the agent ID cached by a previous run first
+    cached_agent_id = _read_cached_agent_id(cache_file) if cache_file else None
+    if cached_agent_id:
+        try:
+            agent = project_client.agents.get_agent(cached_agent_id)
+            if agent.name == name:
+                existing_agent = agent
+        except ResourceNotFoundError:
+            print(f"Cached agent {cached_agent_id} no longer exists")
+
+    if existing_agent is None:
+        try:
+            # Find by name in the agent listing shared across initializers
+            existing_agent = get_agent_by_name(project_client, project_endpoint, name)
+        except Exception as e:
+            print(f"Error listing agents: {e}")
+
+    if existing_agent:
+        # Update existing agent
+        print(f"Found existing agent: {existing_agent.id}")
+        agent = project_client.agents.update_agent(
+            agent_id=existing_agent.id,
+            model=model,
+            name=name,
+            instructions=instructions,
+            toolset=toolset,
+        )
+        print(f"Updated agent, ID: {agent.id}")
+    else:
+        # Create new agent
+        agent = project_client.agents.create_agent(
+            model=model,  # Model deployment name
+            name=name,  # Name of the agent
+            instructions=instructions,  # Instructions for the agent
+            toolset=toolset,
+        )
+        print(f"Created new agent, ID: {agent.id}")
+
+    if cache_file:
+        _write_cached_agent_id(cache_file, agent.id)
+    # A changed agent invalidates any cached redeployment check
+    VERIFY_CACHE_FILE.unlink(missing_ok=True)
+
+    return agent
+
+
+async def ensure_agent_async(project_client, agents_by_name: dict, name: str, instructions: str,
+                             toolset: Optional[ToolSet] = None, cache_key: Optional[str] = None):
+    """
+    Async variant of ensure_agent, for deploying several agents concurrently.
+
+    Args:
+        project_client: An azure.ai.projects.aio.AIProjectClient
+        agents_by_name: Existing agents keyed by name, from one shared listing
+        name: Agent name, used to find an existing agent
+        instructions: Agent instructions, already read from the prompts directory
+        toolset: Tools to attach to the agent, if any
+        cache_key: If set, remember the agent ID under this key between runs
+
+    Returns:
+        The created or updated agent
+    """
+    model = os.environ["AZURE_AI_AGENT_MODEL_DEPLOYMENT_NAME"]
+
+    existing_agent = agents_by_name.get(name)
+    if existing_agent:
+        # Update existing agent
+        print(f"Found existing agent: {existing_agent.id}")
+        agent = await project_client.agents.update_agent(
+            agent_id=existing_agent.id,
+            model=model,
+            name=name,
+            instructions=instructions,
+            toolset=toolset,
+        )
+        print(f"Updated agent, ID: {agent.id}")
+    else:
+        # Create new agent
+        agent = await project_client.agents.create_agent(
+            model=model,
+            name=name,
+            instructions=instructions,
+            toolset=toolset,
+        )
+        print(f"Created new agent, ID: {agent.id}")
+
+    if cache_key:
+        _write_cached_agent_id(AGENT_CACHE_DIR / f"{cache_key}.json", agent.id)
+    VERIFY_CACHE_FILE.unlink(missing_ok=True)
+
+    return agent
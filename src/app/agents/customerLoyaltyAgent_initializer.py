@@ -1,8 +1,9 @@
-import os
 import sys
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from azure.ai.projects import AIProjectClient
-from azure.identity import DefaultAzureCredential
+from pathlib import Path
+# app/ for the tools package, src/ for utils
+_APP_DIR = Path(__file__).resolve().parents[1]
+sys.path.extend((str(_APP_DIR), str(_APP_DIR.parent)))
+from app.agents._common import ensure_agent
 from azure.ai.agents.models import FunctionTool, ToolSet
 from typing import Callable, Set, Any
 from tools.discountLogic import calculate_discount
@@ -10,58 +11,23 @@ from tools.discountLogic import calculate_discount
 from dotenv import load_dotenv
 load_dotenv()
 
-CL_PROMPT_TARGET = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'prompts', 'CustomerLoyaltyAgentPrompt.txt')
-with open(CL_PROMPT_TARGET, 'r', encoding='utf-8') as file:
-    CL_PROMPT = file.read()
+AGENT_NAME = "Zava Customer Loyalty Agent"
+PROMPT_NAME = 'CustomerLoyaltyAgentPrompt.txt'
+# Remember the agent ID between runs so the full agent listing can be skipped
+CACHE_KEY = 'customer_loyalty'
 
-project_endpoint= os.getenv("AZURE_AI_AGENT_ENDPOINT")
-project_client = AIProjectClient(
-    endpoint=project_endpoint,
-    credential=DefaultAzureCredential(),
-)
 
-user_functions: Set[Callable[..., Any]] = {
-    calculate_discount,
-}
+def build_toolset() -> ToolSet:
+    user_functions: Set[Callable[..., Any]] = {
+        calculate_discount,
+    }
 
-# Initialize agent toolset with user functions
-functions = FunctionTool(user_functions)
-toolset = ToolSet()
-toolset.add(functions)
-project_client.agents.enable_auto_function_calls(tools=functions)
+    # Initialize agent toolset with user functions
+    functions = FunctionTool(user_functions)
+    toolset = ToolSet()
+    toolset.add(functions)
+    return toolset
 
-with project_client:
-    # Check if agent already exists
-    agent_name = "Zava Customer Loyalty Agent"
-    existing_agent = None
-    
-    try:
-        # List existing agents and find by name
-        agents_list = project_client.agents.list_agents()
-        for agent in agents_list:
-            if agent.name == agent_name:
-                existing_agent = agent
-                break
-    except Exception as e:
-        print(f"Error listing agents: {e}")
-    
-    if existing_agent:
-        # Update existing agent
-        print(f"Found existing agent: {existing_agent.id}")
-        agent = project_client.agents.update_agent(
-            agent_id=existing_agent.id,
-            model=os.getenv("AZURE_AI_AGENT_MODEL_DEPLOYMENT_NAME"),
-            name=agent_name,
-            instructions=CL_PROMPT,
-            toolset=toolset,
-        )
-        print(f"Updated agent, ID: {agent.id}")
-    else:
-        # Create new agent
-        agent = project_client.agents.create_agent(
-            model=os.getenv("AZURE_AI_AGENT_MODEL_DEPLOYMENT_NAME"),  # Model deployment name
-            name=agent_name,  # Name of the agent
-            instructions=CL_PROMPT,  # Instructions for the agent
-            toolset=toolset,
-        )
-        print(f"Created new agent, ID: {agent.id}")
\ No newline at end of file
+
+if __name__ == "__main__":
+    agent = ensure_agent(AGENT_NAME, PROMPT_NAME, build_toolset(), cache_key=CACHE_KEY)
\ No newline at end of file
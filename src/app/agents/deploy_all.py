@@ -0,0 +1,66 @@
+"""
+Create or update all four agents from one process, concurrently.
+
+Run from src/ with: python -m app.agents.deploy_all
+"""
+import asyncio
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+# app/ for the tools package, src/ for utils
+_APP_DIR = Path(__file__).resolve().parents[1]
+sys.path.extend((str(_APP_DIR), str(_APP_DIR.parent)))
+from dotenv import load_dotenv
+from azure.ai.projects.aio import AIProjectClient
+from azure.identity.aio import DefaultAzureCredential
+from utils.paths import load_prompt
+from app.agents._common import ensure_agent_async
+from app.agents import (
+    customerLoyaltyAgent_initializer as loyalty,
+    interiorDesignAgent_initializer as interior_design,
+    inventoryAgent_initializer as inventory,
+    shopperAgent_initializer as shopper,
+)
+
+load_dotenv()
+
+# Agent name -> (prompt file, toolset, agent ID cache key)
+AGENTS = {
+    shopper.AGENT_NAME: (shopper.PROMPT_NAME, shopper.build_toolset(), None),
+    interior_design.AGENT_NAME: (interior_design.PROMPT_NAME, interior_design.build_toolset(), None),
+    inventory.AGENT_NAME: (inventory.PROMPT_NAME, inventory.build_toolset(), None),
+    loyalty.AGENT_NAME: (loyalty.PROMPT_NAME, loyalty.build_toolset(), loyalty.CACHE_KEY),
+}
+
+
+async def deploy_all():
+    """Create or update every agent over one async client, all calls in flight at once."""
+    # Read the prompt files in parallel while nothing else is running
+    with ThreadPoolExecutor(max_workers=len(AGENTS)) as executor:
+        prompts = dict(zip(AGENTS, executor.map(load_prompt, (prompt for prompt, _, _ in AGENTS.values()))))
+
+    async with DefaultAzureCredential() as credential, AIProjectClient(
+        endpoint=os.environ["AZURE_AI_AGENT_ENDPOINT"],
+        credential=credential,
+    ) as project_client:
+        # List the existing agents once for all four lookups; first match wins
+        agents_by_name = {}
+        async for agent in project_client.agents.list_agents():
+            agents_by_name.setdefault(agent.name, agent)
+
+        return await asyncio.gather(*(
+            ensure_agent_async(
+                project_client,
+                agents_by_name,
+                name,
+                prompts[name],
+                toolset,
+                cache_key=cache_key,
+            )
+            for name, (_, toolset, cache_key) in AGENTS.items()
+        ))
+
+
+if __name__ == "__main__":
+    asyncio.run(deploy_all())
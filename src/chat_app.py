@@ -1,7 +1,6 @@
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.responses import HTMLResponse
 import os
-from dotenv import load_dotenv
 from azure.ai.projects import AIProjectClient
 from azure.identity import DefaultAzureCredential
 from azure.ai.inference.models import SystemMessage, UserMessage
@@ -42,7 +41,8 @@ from services.agent_service import get_or_create_agent_processor
 from services.handoff_service import call_handoff, select_agent
 from services.fallback_service import call_fallback, cora_fallback
 
-load_dotenv(override=True)
+# Reads .env once; every later settings lookup reuses the cached values
+env_vars = load_env_vars()
 
 # Configure structured logging
 logging.basicConfig(
@@ -331,8 +331,6 @@ def cart_update(llm_client, cart_update_prompt: str):
 
 app = FastAPI()
 
-load_dotenv()
-env_vars = load_env_vars()
 validated_env_vars = validate_env_vars(env_vars)
 
 project_endpoint = os.environ.get("AZURE_AI_AGENT_ENDPOINT")
@@ -4,55 +4,78 @@ Script to delete all AI agents from Azure AI Studio
 This will clean up existing agents before redeploying via GitHub Actions
 """
 
+import asyncio
+import logging
 import os
 from dotenv import load_dotenv
-from azure.ai.projects import AIProjectClient
-from azure.identity import DefaultAzureCredential
+from azure.ai.projects.aio import AIProjectClient
+from azure.identity.aio import DefaultAzureCredential
+
+from utils.paths import VERIFY_CACHE_FILE
 
 # Load environment variables
 load_dotenv()
 
-def delete_all_agents():
+logger = logging.getLogger(__name__)
+
+# Maximum number of delete requests in flight at once
+MAX_CONCURRENT_DELETES = 10
+
+async def delete_all_agents():
     """Delete all existing AI agents from the Azure AI Studio project"""
     
     try:
         # Initialize the AI Project client
-        project_client = AIProjectClient(
+        async with DefaultAzureCredential() as credential, AIProjectClient(
             endpoint=os.environ["AZURE_AI_AGENT_ENDPOINT"],
-            credential=DefaultAzureCredential()
-        )
-        
-        print("🔍 Listing all existing AI agents...")
-        
-        # List all agents
-        agents = project_client.agents.list_agents()
-        agent_list = []
-        
-        for agent in agents:
-            agent_list.append(agent)
-            print(f"Found agent: {agent.name} (ID: {agent.id})")
-        
-        if not agent_list:
-            print("✅ No agents found to delete.")
-            return
-        
-        print(f"\n🗑️  Deleting {len(agent_list)} agents...")
-        
-        # Delete each agent
-        for agent in agent_list:
-            try:
-                print(f"Deleting agent: {agent.name} (ID: {agent.id})")
-                project_client.agents.delete_agent(agent.id)
-                print(f"✅ Successfully deleted agent: {agent.name}")
-            except Exception as e:
-                print(f"❌ Failed to delete agent {agent.name}: {str(e)}")
-        
-        print("\n🎉 Agent cleanup completed!")
+            credential=credential
+        ) as project_client:
+            
+            logger.info("🔍 Listing all existing AI agents...")
+            
+            # List all agents
+            agent_list = []
+            
+            async for agent in project_client.agents.list_agents():
+                agent_list.append(agent)
+            
+            if not agent_list:
+                logger.info("✅ No agents found to delete.")
+                return
+            
+            logger.info("\n🗑️  Deleting %d agents...", len(agent_list))
+            
+            # Delete agents concurrently, bounded so the service isn't flooded
+            semaphore = asyncio.Semaphore(MAX_CONCURRENT_DELETES)
+            
+            async def bounded_delete(agent):
+                async with semaphore:
+                    await project_client.agents.delete_agent(agent.id)
+            
+            # Issue all deletes as one bulk operation and collect the failures
+            # instead of letting the first one abort the rest
+            results = await asyncio.gather(
+                *[bounded_delete(agent) for agent in agent_list],
+                return_exceptions=True
+            )
+            # Any cached redeployment check no longer reflects the project
+            VERIFY_CACHE_FILE.unlink(missing_ok=True)
+            
+            # Report outcomes only once the deletes are done, so logging never
+            # interleaves with the requests in flight
+            for agent, result in zip(agent_list, results):
+                if isinstance(result, Exception):
+                    logger.error("❌ Failed to delete agent %s: %s", agent.name, result)
+                else:
+                    logger.info("✅ Successfully deleted agent: %s (ID: %s)", agent.name, agent.id)
+            
+            logger.info("\n🎉 Agent cleanup completed!")
         
     except Exception as e:
-        print(f"❌ Error during agent cleanup: {str(e)}")
+        logger.error("❌ Error during agent cleanup: %s", e)
         raise
 
 if __name__ == "__main__":
-    print("🚀 Starting AI Agent cleanup process...")
-    delete_all_agents()
\ No newline at end of file
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    logger.info("🚀 Starting AI Agent cleanup process...")
+    asyncio.run(delete_all_agents())
\ No newline at end of file
@@ -1,6 +1,10 @@
 import os
-import json
-import requests
+import re
+import time
+import atexit
+import httpx
+import orjson
+from datetime import datetime
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -23,6 +27,10 @@ headers = {
     'api-key': SEARCH_KEY
 }
 
+# One keep-alive HTTP/2 client for every call to the search endpoint
+client = httpx.Client(http2=True, headers=headers, limits=httpx.Limits(max_keepalive_connections=32), timeout=60)
+atexit.register(client.close)
+
 # Step 1: Create Data Source (using Managed Identity)
 datasource_definition = {
     "name": "cosmosdb-datasource",
@@ -130,12 +138,17 @@ indexer_definition = {
     }
 }
 
+# The definitions never change, so serialize them once; Content-Type is set on the client
+_DATASOURCE_BODY = orjson.dumps(datasource_definition)
+_INDEX_BODY = orjson.dumps(index_definition)
+_INDEXER_BODY = orjson.dumps(indexer_definition)
+
 def create_or_update_datasource():
     """Create or update the Cosmos DB data source"""
     url = f"{SEARCH_ENDPOINT}/datasources/{datasource_definition['name']}?api-version=2023-11-01"
     
     # Try to create new datasource
-    response = requests.put(url, json=datasource_definition, headers=headers)
+    response = client.put(url, content=_DATASOURCE_BODY)
     
     if response.status_code in [200, 201]:
         print(f"✅ Data source '{datasource_definition['name']}' created/updated successfully")
@@ -149,7 +162,7 @@ def create_or_update_index():
     """Create or update the search index"""
     url = f"{SEARCH_ENDPOINT}/indexes/{INDEX_NAME}?api-version=2023-11-01"
     
-    response = requests.put(url, json=index_definition, headers=headers)
+    response = client.put(url, content=_INDEX_BODY)
     
     if response.status_code in [200, 201]:
         print(f"✅ Search index '{INDEX_NAME}' created/updated successfully")
@@ -163,7 +176,7 @@ def create_or_update_indexer():
     """Create or update the indexer"""
     url = f"{SEARCH_ENDPOINT}/indexers/{indexer_definition['name']}?api-version=2023-11-01"
     
-    response = requests.put(url, json=indexer_definition, headers=headers)
+    response = client.put(url, content=_INDEXER_BODY)
     
     if response.status_code in [200, 201]:
         print(f"✅ Indexer '{indexer_definition['name']}' created/updated successfully")
@@ -177,7 +190,7 @@ def run_indexer():
     """Run the indexer to import data"""
     url = f"{SEARCH_ENDPOINT}/indexers/{indexer_definition['name']}/run?api-version=2023-11-01"
     
-    response = requests.post(url, headers=headers)
+    response = client.post(url)
     
     if response.status_code == 202:
         print(f"✅ Indexer '{indexer_definition['name']}' started successfully")
@@ -187,14 +200,62 @@ def run_indexer():
         print(f"Response: {response.text}")
         return False
 
-def check_indexer_status():
-    """Check the status of the indexer"""
+def get_indexer_status():
+    """Get the parsed indexer status, or None if the request fails"""
     url = f"{SEARCH_ENDPOINT}/indexers/{indexer_definition['name']}/status?api-version=2023-11-01"
     
-    response = requests.get(url, headers=headers)
+    response = client.get(url)
     
     if response.status_code == 200:
-        status = response.json()
+        return response.json()
+    print(f"❌ Failed to get indexer status: {response.status_code}")
+    return None
+
+def parse_timestamp(value):
+    """Parse a search service timestamp such as 2024-05-01T12:00:00.1234567Z, or return None"""
+    if not value:
+        return None
+    # fromisoformat wants an explicit offset and at most 6 fractional digits
+    value = re.sub(r'(\.\d{6})\d+', r'\1', value.replace('Z', '+00:00'))
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+def last_run_start_time(status):
+    """Start time of the indexer's most recent run from its status, or None"""
+    last_result = (status or {}).get('lastResult') or {}
+    return parse_timestamp(last_result.get('startTime'))
+
+def wait_for_indexer(previous_start, timeout=300, initial_delay=0.5, max_delay=8):
+    """Poll the indexer with exponential backoff until a run newer than previous_start finishes"""
+    delay = initial_delay
+    deadline = time.monotonic() + timeout
+    
+    while True:
+        status = get_indexer_status()
+        if status is None:
+            return
+        # Right after run_indexer() lastResult is still empty or describes the
+        # previous run. Comparing against the service's own timestamp for that
+        # run, rather than the local clock, keeps this immune to clock skew.
+        last_result = status.get('lastResult') or {}
+        start_time = last_run_start_time(status)
+        if (start_time is not None
+                and (previous_start is None or start_time > previous_start)
+                and last_result.get('status') != 'inProgress'):
+            return
+        if time.monotonic() + delay > deadline:
+            print(f"⚠️ Indexer still running after {timeout} seconds")
+            return
+        time.sleep(delay)
+        delay = min(delay * 2, max_delay)
+
+def check_indexer_status():
+    """Check the status of the indexer"""
+    status = get_indexer_status()
+    
+    if status is not None:
         print(f"Indexer Status: {status.get('status', 'Unknown')}")
         if 'lastResult' in status:
             last_result = status['lastResult']
@@ -204,7 +265,6 @@ def check_indexer_status():
                 print(f"Error: {last_result['errorMessage']}")
         return True
     else:
-        print(f"❌ Failed to get indexer status: {response.status_code}")
         return False
 
 def main():
@@ -227,12 +287,13 @@ def main():
     
     # Step 4: Run indexer
     print("\n🏃 Step 4: Running indexer to import data...")
+    # Remember the previous run so the wait below can tell the new one apart
+    previous_start = last_run_start_time(get_indexer_status())
     if not run_indexer():
         return
     
     print("\n⏳ Waiting for indexer to complete...")
-    import time
-    time.sleep(10)  # Wait 10 seconds
+    wait_for_indexer(previous_start)
     
     # Step 5: Check status
     print("\n📋 Step 5: Checking indexer status...")
@@ -1,9 +1,12 @@
 import os
-import json
-import requests
+import gzip
+import asyncio
+import atexit
+import httpx
+import orjson
 from dotenv import load_dotenv
-from azure.cosmos import CosmosClient
-from azure.identity import DefaultAzureCredential
+from azure.cosmos.aio import CosmosClient
+from azure.identity.aio import DefaultAzureCredential
 
 load_dotenv()
 
@@ -16,12 +19,25 @@ COSMOS_ENDPOINT = os.environ.get("COSMOS_ENDPOINT")
 print(f"Search Endpoint: {SEARCH_ENDPOINT}")
 print(f"Index Name: {INDEX_NAME}")
 
+# Documents per upload; 1000 is the most Azure Search accepts per request
+BATCH_SIZE = 1000
+
+# Uncompressed payload size above which a batch is split, below the 16 MB request limit
+MAX_BATCH_BYTES = 14 * 1024 * 1024
+
+# Maximum number of batch uploads in flight at once
+MAX_CONCURRENT_UPLOADS = 8
+
 # Headers for Azure Search REST API
 headers = {
     'Content-Type': 'application/json',
     'api-key': SEARCH_KEY
 }
 
+# One keep-alive HTTP/2 client for the one-off calls to the search endpoint
+client = httpx.Client(http2=True, headers=headers, timeout=60)
+atexit.register(client.close)
+
 # Create Index Schema (without data source dependency)
 index_definition = {
     "name": INDEX_NAME,
@@ -92,11 +108,14 @@ index_definition = {
     ]
 }
 
+# The definition never changes, so serialize it once; Content-Type is set on the client
+_INDEX_BODY = orjson.dumps(index_definition)
+
 def create_index():
     """Create the search index"""
     url = f"{SEARCH_ENDPOINT}/indexes/{INDEX_NAME}?api-version=2023-11-01"
     
-    response = requests.put(url, json=index_definition, headers=headers)
+    response = client.put(url, content=_INDEX_BODY)
     
     if response.status_code in [200, 201, 204]:
         print(f"✅ Search index '{INDEX_NAME}' created successfully")
@@ -106,69 +125,117 @@ def create_index():
         print(f"Response: {response.text}")
         return False
 
-def get_cosmos_data():
-    """Get data from Cosmos DB using Azure AD auth"""
+def to_search_document(doc):
+    """Map a Cosmos DB item to a search index document"""
+    return {
+        "id": str(doc.get("id", doc.get("ProductID", ""))),
+        "ProductID": str(doc.get("ProductID", "")),
+        "ProductName": doc.get("ProductName", ""),
+        "ProductCategory": doc.get("ProductCategory", ""), 
+        "ProductDescription": doc.get("ProductDescription", ""),
+        "ProductPrice": float(doc.get("ProductPrice", 0)) if doc.get("ProductPrice") else 0.0,
+        "ProductImageURL": doc.get("ProductImageURL", ""),
+        "content_for_vector": doc.get("content_for_vector", "")
+    }
+
+async def iter_cosmos_docs():
+    """Stream search documents from Cosmos DB using Azure AD auth, one item at a time"""
+    item_count = 0
     try:
-        credential = DefaultAzureCredential()
-        client = CosmosClient(COSMOS_ENDPOINT, credential)
-        database = client.get_database_client("zava")
-        container = database.get_container_client("product_catalog")
-        
-        # Get all items from container
-        items = list(container.read_all_items())
-        print(f"Retrieved {len(items)} items from Cosmos DB")
-        return items
+        async with DefaultAzureCredential() as credential, CosmosClient(COSMOS_ENDPOINT, credential) as client:
+            database = client.get_database_client("zava")
+            container = database.get_container_client("product_catalog")
+            
+            # Cosmos DB returns results a page at a time, so only the current
+            # page and the batch being built are held in memory
+            async for item in container.query_items("SELECT * FROM c", max_item_count=BATCH_SIZE):
+                item_count += 1
+                yield to_search_document(item)
     except Exception as e:
         print(f"Error retrieving data from Cosmos DB: {e}")
-        return []
+    
+    print(f"Retrieved {item_count} items from Cosmos DB")
 
-def upload_to_search_index(documents):
-    """Upload documents directly to the search index"""
-    if not documents:
-        print("No documents to upload")
-        return False
+async def produce_batches(queue):
+    """Group Cosmos DB documents into upload batches, then tell each uploader to stop"""
+    batch_number = 0
+    batch = []
+    async for doc in iter_cosmos_docs():
+        batch.append(doc)
+        if len(batch) == BATCH_SIZE:
+            batch_number += 1
+            await queue.put((batch_number, batch))
+            batch = []
+    if batch:
+        await queue.put((batch_number + 1, batch))
+    # Only signal the end after a clean read; on failure the task group
+    # cancels the uploaders instead
+    for _ in range(MAX_CONCURRENT_UPLOADS):
+        await queue.put(None)
+
+async def send_batch(async_client, url, batch_number, batch):
+    """Upload one batch of documents, splitting it if the payload is too large"""
+    # Create upload batch
+    upload_batch = {
+        "value": [{"@search.action": "mergeOrUpload", **doc} for doc in batch]
+    }
+    body = orjson.dumps(upload_batch)
     
-    # Prepare documents for search index
-    search_documents = []
-    for doc in documents:
-        search_doc = {
-            "id": str(doc.get("id", doc.get("ProductID", ""))),
-            "ProductID": str(doc.get("ProductID", "")),
-            "ProductName": doc.get("ProductName", ""),
-            "ProductCategory": doc.get("ProductCategory", ""), 
-            "ProductDescription": doc.get("ProductDescription", ""),
-            "ProductPrice": float(doc.get("ProductPrice", 0)) if doc.get("ProductPrice") else 0.0,
-            "ProductImageURL": doc.get("ProductImageURL", ""),
-            "content_for_vector": doc.get("content_for_vector", "")
-        }
-        search_documents.append(search_doc)
+    # Azure Search rejects payloads over 16 MB, so halve oversized batches
+    if len(body) > MAX_BATCH_BYTES and len(batch) > 1:
+        middle = len(batch) // 2
+        return (
+            await send_batch(async_client, url, batch_number, batch[:middle])
+            + await send_batch(async_client, url, batch_number, batch[middle:])
+        )
     
-    # Upload in batches
-    batch_size = 50
-    total_uploaded = 0
+    # Product text compresses well, so send the body gzipped
+    response = await async_client.post(
+        url,
+        content=gzip.compress(body),
+        headers={'Content-Encoding': 'gzip'}
+    )
+    if response.status_code in [200, 207]:
+        print(f"✅ Uploaded batch {batch_number}: {len(batch)} documents")
+        return len(batch)
     
-    for i in range(0, len(search_documents), batch_size):
-        batch = search_documents[i:i + batch_size]
-        
-        # Create upload batch
-        upload_batch = {
-            "value": [{"@search.action": "mergeOrUpload", **doc} for doc in batch]
-        }
-        
-        url = f"{SEARCH_ENDPOINT}/indexes/{INDEX_NAME}/docs/index?api-version=2023-11-01"
-        response = requests.post(url, json=upload_batch, headers=headers)
-        
-        if response.status_code in [200, 207]:
-            total_uploaded += len(batch)
-            print(f"✅ Uploaded batch {i//batch_size + 1}: {len(batch)} documents")
-        else:
-            print(f"❌ Failed to upload batch {i//batch_size + 1}: {response.status_code}")
-            print(f"Response: {response.text}")
+    print(f"❌ Failed to upload batch {batch_number}: {response.status_code}")
+    print(f"Response: {response.text}")
+    return 0
+
+async def upload_batches(async_client, queue):
+    """Upload batches from the queue until the producer is done"""
+    url = f"{SEARCH_ENDPOINT}/indexes/{INDEX_NAME}/docs/index?api-version=2023-11-01"
+    uploaded = 0
+    
+    while (entry := await queue.get()) is not None:
+        batch_number, batch = entry
+        uploaded += await send_batch(async_client, url, batch_number, batch)
+    
+    return uploaded
+
+async def upload_to_search_index():
+    """Stream documents from Cosmos DB directly into the search index"""
+    # The bounded queue lets Cosmos DB reads overlap with uploads while
+    # capping how many batches are held in memory
+    queue = asyncio.Queue(maxsize=4)
     
+    # The uploads multiplex over HTTP/2 on a shared connection pool. If the
+    # producer or any uploader fails, the task group cancels the rest (so the
+    # producer can't block on a full queue nobody drains) and raises the error.
+    async with httpx.AsyncClient(http2=True, headers=headers, timeout=60) as async_client:
+        async with asyncio.TaskGroup() as task_group:
+            task_group.create_task(produce_batches(queue))
+            uploaders = [
+                task_group.create_task(upload_batches(async_client, queue))
+                for _ in range(MAX_CONCURRENT_UPLOADS)
+            ]
+    
+    total_uploaded = sum(uploader.result() for uploader in uploaders)
     print(f"🎉 Total documents uploaded: {total_uploaded}")
     return total_uploaded > 0
 
-def main():
+async def main():
     print("🚀 Creating Azure AI Search index and uploading data...")
     
     # Step 1: Create index
@@ -176,21 +243,13 @@ def main():
     if not create_index():
         return
     
-    # Step 2: Get data from Cosmos DB
-    print("\n📊 Step 2: Retrieving data from Cosmos DB...")
-    documents = get_cosmos_data()
-    
-    if not documents:
-        print("❌ No data retrieved from Cosmos DB")
-        return
-    
-    # Step 3: Upload data to search index
-    print(f"\n📤 Step 3: Uploading {len(documents)} documents to search index...")
-    if upload_to_search_index(documents):
+    # Step 2: Stream data from Cosmos DB into the search index
+    print("\n📤 Step 2: Streaming data from Cosmos DB to search index...")
+    if await upload_to_search_index():
         print("\n🎉 Successfully created search index and uploaded data!")
         print(f"📍 Your search index '{INDEX_NAME}' is ready to use.")
     else:
         print("\n❌ Failed to upload data to search index")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    asyncio.run(main())
\ No newline at end of file
@@ -0,0 +1,162 @@
+import asyncio
+
+import pytest
+
+from a2a.agent import executor as executor_module
+from a2a.agent.executor import AgentExecutor, ExecutionStatus, ExecutionStore
+
+
+class FakeAgent:
+    """Stands in for the Enhanced Product Manager without calling Azure OpenAI"""
+
+    def __init__(self, delay=0.0, chunks=("Hello", ", ", "world")):
+        self.delay = delay
+        self.chunks = chunks
+
+    async def process_message(self, message):
+        await asyncio.sleep(self.delay)
+        return f"echo: {message}"
+
+    async def stream_message(self, message):
+        for chunk in self.chunks:
+            await asyncio.sleep(self.delay)
+            yield chunk
+
+
+@pytest.fixture
+def make_executor(monkeypatch):
+    def make(agent=None):
+        agent = agent or FakeAgent()
+        monkeypatch.setattr(executor_module, "get_enhanced_product_manager", lambda: agent)
+        return AgentExecutor()
+    return make
+
+
+def test_store_evicts_oldest_finished_entry_first():
+    store = ExecutionStore(max_size=3)
+    store["a"] = {"status": ExecutionStatus.RUNNING}
+    store["b"] = {"status": ExecutionStatus.COMPLETED}
+    store["c"] = {"status": ExecutionStatus.PENDING}
+    store["d"] = {"status": ExecutionStatus.FAILED}
+
+    assert list(store) == ["a", "c", "d"]
+
+    store["e"] = {"status": ExecutionStatus.RUNNING}
+
+    assert list(store) == ["a", "c", "e"]
+
+
+def test_store_drops_oldest_when_every_entry_is_active():
+    store = ExecutionStore(max_size=2)
+    store["a"] = {"status": ExecutionStatus.RUNNING}
+    store["b"] = {"status": ExecutionStatus.PENDING}
+    store["c"] = {"status": ExecutionStatus.RUNNING}
+
+    assert list(store) == ["b", "c"]
+
+
+def test_execute_records_completed_result(make_executor):
+    agent_executor = make_executor()
+
+    result = asyncio.run(agent_executor.execute({"message": "hi"}))
+
+    status = agent_executor.get_execution_status(result["execution_id"])
+    assert result["response"] == "echo: hi"
+    assert status["status"] == ExecutionStatus.COMPLETED
+    assert status["result"]["response"] == "echo: hi"
+
+
+def test_cancel_pending_submission_stops_it(make_executor):
+    agent_executor = make_executor(FakeAgent(delay=0.05))
+
+    async def scenario():
+        execution_id = agent_executor.submit({"message": "hi"})
+        # Cancel before the task has had a chance to start
+        cancelled = await agent_executor.cancel(execution_id)
+        await asyncio.sleep(0.1)
+        return execution_id, cancelled
+
+    execution_id, cancelled = asyncio.run(scenario())
+
+    status = agent_executor.get_execution_status(execution_id)
+    assert cancelled["status"] == "cancelled"
+    assert status["status"] == ExecutionStatus.CANCELLED
+    assert status["result"] is None
+    assert execution_id not in agent_executor._tasks
+
+
+def test_cancel_running_submission_is_not_overwritten(make_executor):
+    agent_executor = make_executor(FakeAgent(delay=0.05))
+
+    async def scenario():
+        execution_id = agent_executor.submit({"message": "hi"})
+        await asyncio.sleep(0.01)
+        assert agent_executor.get_execution_status(execution_id)["status"] == ExecutionStatus.RUNNING
+        await agent_executor.cancel(execution_id)
+        await asyncio.sleep(0.1)
+        return execution_id
+
+    execution_id = asyncio.run(scenario())
+
+    assert agent_executor.get_execution_status(execution_id)["status"] == ExecutionStatus.CANCELLED
+
+
+def test_cancel_finished_execution_is_rejected(make_executor):
+    agent_executor = make_executor()
+
+    async def scenario():
+        result = await agent_executor.execute({"message": "hi"})
+        return await agent_executor.cancel(result["execution_id"])
+
+    assert asyncio.run(scenario())["status"] == "error"
+
+
+def test_stream_status_transitions(make_executor):
+    agent_executor = make_executor()
+
+    async def scenario():
+        execution_id, chunks = agent_executor.stream({"message": "hi"})
+        statuses = [agent_executor.get_execution_status(execution_id)["status"]]
+        received = []
+        async for chunk in chunks:
+            received.append(chunk)
+            statuses.append(agent_executor.get_execution_status(execution_id)["status"])
+        statuses.append(agent_executor.get_execution_status(execution_id)["status"])
+        return execution_id, received, statuses
+
+    execution_id, received, statuses = asyncio.run(scenario())
+
+    assert received == ["Hello", ", ", "world"]
+    assert statuses[0] == ExecutionStatus.PENDING
+    assert set(statuses[1:-1]) == {ExecutionStatus.RUNNING}
+    assert statuses[-1] == ExecutionStatus.COMPLETED
+    assert agent_executor.get_execution_status(execution_id)["result"]["response"] == "Hello, world"
+
+
+def test_stream_closed_early_is_cancelled(make_executor):
+    agent_executor = make_executor()
+
+    async def scenario():
+        execution_id, chunks = agent_executor.stream({"message": "hi"})
+        await chunks.__anext__()
+        await chunks.aclose()
+        return execution_id
+
+    execution_id = asyncio.run(scenario())
+
+    assert agent_executor.get_execution_status(execution_id)["status"] == ExecutionStatus.CANCELLED
+
+
+def test_stream_without_message_fails(make_executor):
+    agent_executor = make_executor()
+
+    async def scenario():
+        execution_id, chunks = agent_executor.stream({"message": ""})
+        return execution_id, [chunk async for chunk in chunks]
+
+    execution_id, received = asyncio.run(scenario())
+
+    status = agent_executor.get_execution_status(execution_id)
+    assert status["status"] == ExecutionStatus.FAILED
+    assert "Message is required" in status["error"]
+    assert len(received) == 1
@@ -0,0 +1,78 @@
+from a2a.agent import llm_cache as llm_cache_module
+from a2a.agent.llm_cache import LLMCache
+
+
+class FakeClock:
+    """Stands in for time.monotonic so expiry can be tested without sleeping"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_get_returns_stored_response():
+    cache = LLMCache()
+    key = LLMCache.make_key("agent", "hello")
+
+    assert cache.get(key) is None
+    cache.put(key, "hi there")
+    assert cache.get(key) == "hi there"
+
+
+def test_keys_keep_case_and_whitespace():
+    keys = {
+        LLMCache.make_key("agent", "SKU-ab12"),
+        LLMCache.make_key("agent", "sku-ab12"),
+        LLMCache.make_key("agent", "SKU-ab12 "),
+        LLMCache.make_key("agent", "SKU -ab12"),
+    }
+
+    assert len(keys) == 4
+
+
+def test_keys_include_namespace_and_history():
+    history = [{"role": "user", "content": "hi"}, {"role": "assistant", "content": "hello"}]
+
+    assert LLMCache.make_key("gpt-4.1", "q") != LLMCache.make_key("gpt-4o", "q")
+    assert LLMCache.make_key("agent", *LLMCache.history_parts(history), "q") != LLMCache.make_key("agent", "q")
+    assert LLMCache.history_parts(None) == []
+
+
+def test_evicts_least_recently_used():
+    cache = LLMCache(max_size=2)
+    cache.put("a", "1")
+    cache.put("b", "2")
+    # Reading "a" makes "b" the least recently used entry
+    assert cache.get("a") == "1"
+    cache.put("c", "3")
+
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.get("c") == "3"
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(llm_cache_module.time, "monotonic", clock)
+    cache = LLMCache(ttl=10.0)
+    cache.put("a", "1")
+
+    clock.now = 9.0
+    assert cache.get("a") == "1"
+
+    clock.now = 10.0
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_clear_drops_everything():
+    cache = LLMCache()
+    cache.put("a", "1")
+    cache.put("b", "2")
+    cache.clear()
+
+    assert len(cache) == 0
+    assert cache.get("a") is None
@@ -1,40 +1,63 @@
 import os
-from typing import Dict, Optional
+from dataclasses import dataclass, fields
+from functools import lru_cache
+from typing import Any, Optional
 from dotenv import load_dotenv
-load_dotenv(override=True)
-
-def load_env_vars() -> Dict[str, Optional[str]]:
-    """Load environment variables and return as a dictionary."""
-    return {
-        'interior_designer': os.getenv("interior_designer"),
-        'customer_loyalty': os.getenv("customer_loyalty"),
-        'inventory_agent': os.getenv("inventory_agent"),
-        'cora': os.getenv("cora"),
-        'phi_4_endpoint': os.getenv("phi_4_endpoint"),
-        'phi_4_deployment': os.getenv("phi_4_deployment"),
-        'phi_4_api_version': os.getenv("phi_4_api_version"),
-        'phi_4_api_key': os.getenv("phi_4_api_key"),
-        'gpt_endpoint': os.getenv("gpt_endpoint"),
-        'gpt_deployment': os.getenv("gpt_deployment"),
-        'gpt_api_key': os.getenv("gpt_api_key"),
-        'gpt_api_version': os.getenv("gpt_api_version"),
-        'AZURE_OPENAI_ENDPOINT': os.getenv("AZURE_OPENAI_ENDPOINT"),
-        'AZURE_OPENAI_KEY': os.getenv("AZURE_OPENAI_KEY"),
-        'AZURE_OPENAI_API_VERSION': os.getenv("AZURE_OPENAI_API_VERSION"),
-    }
-
-def validate_env_vars(env_vars: Dict[str, Optional[str]]) -> Dict[str, str]:
-    """Validate that required environment variables are set and return validated dict."""
-    required_vars = [
-        'phi_4_endpoint', 'phi_4_api_key', 'phi_4_api_version', 'phi_4_deployment'
-    ]
-    missing_vars = [var for var in required_vars if not env_vars.get(var)]
-    if missing_vars:
-        raise ValueError(f"Missing required environment variables: {', '.join(missing_vars)}")
-    validated_vars = {}
-    for key, value in env_vars.items():
-        if key in required_vars:
-            validated_vars[key] = value  # type: ignore - we know it's not None after validation
-        else:
-            validated_vars[key] = value
-    return validated_vars 
\ No newline at end of file
+
+REQUIRED_VARS = ('phi_4_endpoint', 'phi_4_api_key', 'phi_4_api_version', 'phi_4_deployment')
+
+@dataclass(frozen=True, slots=True)
+class EnvVars:
+    """Environment settings, read once per process."""
+    interior_designer: Optional[str]
+    customer_loyalty: Optional[str]
+    inventory_agent: Optional[str]
+    cora: Optional[str]
+    phi_4_endpoint: str
+    phi_4_deployment: str
+    phi_4_api_version: str
+    phi_4_api_key: str
+    gpt_endpoint: Optional[str]
+    gpt_deployment: Optional[str]
+    gpt_api_key: Optional[str]
+    gpt_api_version: Optional[str]
+    AZURE_OPENAI_ENDPOINT: Optional[str]
+    AZURE_OPENAI_KEY: Optional[str]
+    AZURE_OPENAI_API_VERSION: Optional[str]
+
+    @classmethod
+    def from_env(cls) -> "EnvVars":
+        """Build settings from the environment, raising if a required variable is missing."""
+        env_vars = cls(**{field.name: os.getenv(field.name) for field in fields(cls)})
+        missing_vars = [var for var in REQUIRED_VARS if not getattr(env_vars, var)]
+        if missing_vars:
+            raise ValueError(f"Missing required environment variables: {', '.join(missing_vars)}")
+        return env_vars
+
+    # Dict-style access, for callers written against the old dict of settings
+    def __getitem__(self, key: str) -> Optional[str]:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default)
+
+@lru_cache(maxsize=1)
+def _load_dotenv_once() -> None:
+    load_dotenv(override=True)
+
+@lru_cache(maxsize=1)
+def settings() -> EnvVars:
+    """Load .env and the environment settings on first use, then reuse them."""
+    _load_dotenv_once()
+    return EnvVars.from_env()
+
+def load_env_vars() -> EnvVars:
+    """Load environment variables and return them as validated settings."""
+    return settings()
+
+def validate_env_vars(env_vars: EnvVars) -> EnvVars:
+    """Return the settings; required variables are already checked when they are loaded."""
+    return env_vars
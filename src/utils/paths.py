@@ -0,0 +1,16 @@
+"""
+Filesystem locations shared by the agent initializers and scripts.
+"""
+from functools import lru_cache
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+PROMPTS_DIR = PROJECT_ROOT / "prompts"
+
+# Last successful redeployment check; cleared whenever agents are changed
+VERIFY_CACHE_FILE = Path.home() / ".cache" / "zava_verify.json"
+
+@lru_cache(maxsize=None)
+def load_prompt(name: str) -> str:
+    """Read a prompt file from the prompts directory, once per process."""
+    return (PROMPTS_DIR / name).read_text(encoding="utf-8")